@@ -1,34 +1,60 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Callable, Union
+from collections.abc import Mapping
 import requests
 import logging
 import re
+import sqlite3
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from requests.packages.urllib3.exceptions import InsecureRequestWarning
-# from lxml import etree
+from lxml import etree
 
 import zeep
 from zeep import Client, Settings, Plugin
 from zeep.transports import Transport
+from zeep.cache import Base as BaseCache, SqliteCache
 from zeep.exceptions import Fault
 from zeep.helpers import serialize_object
 
 from isimws.user.isimapplicationuser import ISIMApplicationUser
 
 
-# Zeep plugin used to extract the XML payload for use in debugging
+logger = logging.getLogger(__name__)
+
+
+def _suppress_ssl_warning():
+    # Disable https warning because of non-standard certs on appliance
+    try:
+        logger.debug("Suppressing SSL Warnings.")
+        requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+    except AttributeError:
+        logger.warning("load requests.packages.urllib3.disable_warnings() failed")
+
+
+# The warning filter is process-wide, so it only needs to be installed once
+_suppress_ssl_warning()
+
+
+# Zeep plugin used to extract the XML payload for use in debugging. It should only be registered when debug logging is
+# enabled, as serializing each envelope is expensive.
 class ZeepLoggingPlugin(Plugin):
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         super().__init__()
 
     def ingress(self, envelope, http_headers, operation):
-        # print(etree.tostring(envelope))
-        # self.logger.debug(etree.tostring(envelope))
+        # The log level may have been raised since the plugin was registered
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Received envelope: %s", etree.tostring(envelope))
         return envelope, http_headers
 
     def egress(self, envelope, http_headers, operation, binding_options):
-        # print(etree.tostring(envelope))
-        # self.logger.debug(etree.tostring(envelope))
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Sending envelope: %s", etree.tostring(envelope))
         return envelope, http_headers
 
 
@@ -43,15 +69,104 @@ class IBMFatal(Exception):
 
 
 class IBMResponse(dict):
+    # IBMResponse must remain a dict so that it can be returned to Ansible. Declaring slots for the serialization state
+    # avoids allocating an instance __dict__ for every response.
+    __slots__ = ('_unserialized_data', '_serialization_pending')
+
     def __init__(self, *args, **kwargs):
+        self._unserialized_data = None
+        self._serialization_pending = False
         self.update(*args, **kwargs)
 
+    def set_unserialized_data(self, zeep_response):
+        """
+        Set the data attribute to a raw Zeep response. Serializing a large response is expensive, so it is only
+            converted into Python dicts and lists the first time the data attribute is accessed.
+        :param zeep_response: The Python data structure returned by a Zeep operation.
+        """
+        self._unserialized_data = zeep_response
+        self._serialization_pending = True
+        dict.__setitem__(self, 'data', None)
+
+    def _serialize_data(self):
+        """
+        Serialize any pending Zeep response data and store it in the data attribute.
+        """
+        if self._serialization_pending:
+            dict.__setitem__(self, 'data', serialize_object(self._unserialized_data))
+            self._unserialized_data = None
+            self._serialization_pending = False
+
+    def __getitem__(self, key):
+        if key == 'data':
+            self._serialize_data()
+        return dict.__getitem__(self, key)
+
+    def __setitem__(self, key, value):
+        if key == 'data':
+            self._unserialized_data = None
+            self._serialization_pending = False
+        dict.__setitem__(self, key, value)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def get(self, key, default=None):
+        if key == 'data':
+            self._serialize_data()
+        return dict.get(self, key, default)
+
+    # Overriding __iter__ also ensures that unpacking with ** goes through __getitem__
+    def __iter__(self):
+        self._serialize_data()
+        return dict.__iter__(self)
+
+    def items(self):
+        self._serialize_data()
+        return dict.items(self)
+
+    def values(self):
+        self._serialize_data()
+        return dict.values(self)
+
+    def pop(self, *args):
+        self._serialize_data()
+        return dict.pop(self, *args)
+
+    def popitem(self):
+        self._serialize_data()
+        return dict.popitem(self)
+
+    def setdefault(self, key, default=None):
+        if key == 'data':
+            self._serialize_data()
+        return dict.setdefault(self, key, default)
+
+    def copy(self):
+        self._serialize_data()
+        return IBMResponse(dict.items(self))
+
+    def __eq__(self, other):
+        self._serialize_data()
+        if isinstance(other, IBMResponse):
+            other._serialize_data()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __repr__(self):
+        self._serialize_data()
+        return dict.__repr__(self)
+
     def succeeded_with_data(self):
         """
         Determines whether the execution succeeded with data retrieved.
         :return: True if the execution succeeded and the data is retrieved.
         """
-        if self.get('fault', True) is False and self.get("data"):
+        if self.get('rc') == 0 and self.get("data"):
             return True
         return False
 
@@ -60,7 +175,7 @@ class IBMResponse(dict):
         Determines whether the execution succeeded.
         :return: True if succeeded.
         """
-        if self.get('fault', True) is False:
+        if self.get('rc') == 0:
             return True
         return False
 
@@ -69,12 +184,12 @@ class IBMResponse(dict):
         Determines whether the execution failed.
         :return: True if the execution failed.
         """
-        if self.get('fault', True) is False:
+        if self.get('rc') == 0:
             return False
         return True
 
 
-def create_return_object(rc=0, data=None, warnings=[], changed=False):
+def create_return_object(rc=0, data=None, warnings=None, changed=False):
     """
     Create a response object with the given properties.
     :param rc: The return code of the call. Should be set to 0 on success, or a meaningful error code on failure.
@@ -83,6 +198,9 @@ def create_return_object(rc=0, data=None, warnings=[], changed=False):
     :param changed: Whether there was any change.
     :return: The IBMResponse object.
     """
+    if warnings is None:
+        warnings = []
+
     return IBMResponse({'rc': rc,
                         'data': data,
                         'changed': changed,
@@ -123,28 +241,190 @@ def version_compare(version1, version2):
     :return:
     """
 
-    def normalize(v):
-        v = re.sub(r'_b\d+$', '', v)
-        return [int(x) for x in re.sub(r'(\.0+)*$', '', v).split(".")]
+    normalized_version1 = _normalize_version(version1)
+    normalized_version2 = _normalize_version(version2)
+
+    return (normalized_version1 > normalized_version2) - (normalized_version1 < normalized_version2)
+
+
+# Patterns used to strip build numbers and trailing zero components from version strings
+_version_build_pattern = re.compile(r'_b\d+$')
+_version_trailing_zeros_pattern = re.compile(r'(\.0+)*$')
+
+
+@functools.lru_cache(maxsize=256)
+def _normalize_version(version: str) -> tuple:
+    """
+    Convert a version string into a tuple of integers that can be compared with other normalized versions. The same few
+        version strings are compared on every SOAP call, so the results are cached.
+    :param version: The version string to normalize.
+    :return: A tuple containing each numeric component of the version.
+    """
+    version = _version_build_pattern.sub('', version)
+    return tuple(int(x) for x in _version_trailing_zeros_pattern.sub('', version).split("."))
+
+
+# Maps the name of each SOAP service to the path of it's WSDL relative to the services base URL
+soap_service_wsdls = {
+    "WSSessionService": "WSSessionService?WSDL",
+    "WSOrganizationalContainerService": "WSOrganizationalContainerServiceService?WSDL",
+    "WSPersonService": "WSPersonServiceService?WSDL",
+    "WSAccountService": "WSAccountServiceService?WSDL",
+    "WSRoleService": "WSRoleServiceService?WSDL",
+    "WSServiceService": "WSServiceServiceService?WSDL",
+    "WSProvisioningPolicyService": "WSProvisioningPolicyServiceService?WSDL",
+    "WSPasswordService": "WSPasswordServiceService?WSDL",
+    "WSRequestService": "WSRequestServiceService?WSDL",
+    "WSSystemUserService": "WSSystemUserServiceService?WSDL",
+    "WSGroupService": "WSGroupServiceService?WSDL",
+    "WSSearchDataService": "WSSearchDataServiceService?WSDL"
+}
+
+# The number of seconds that cached WSDL and XSD documents are reused for before they are fetched from the server again
+_wsdl_cache_timeout = 86400
+
+
+# Prefixes of SOAP operations that don't make any changes. Any other operation should result in a change.
+_read_only_operation_prefixes = ("get", "is", "login", "logout", "search", "lookup", "test", "find")
+
+
+@functools.lru_cache(maxsize=256)
+def _is_read_only_operation(operation: str) -> bool:
+    """
+    Determine whether a SOAP operation only reads data. Operation names come from a small, fixed set, so the results
+        are cached.
+    :param operation: The name of the SOAP operation.
+    :return: True if the operation doesn't make any changes.
+    """
+    return operation.lower().startswith(_read_only_operation_prefixes)
+
+
+# Sizing of the HTTP connection pool shared by all of the SOAP service clients. All of the services are on the same host,
+# so only a few pools are needed, but each pool should keep enough connections alive for every thread that may be making
+# calls at once, such as when the clients are preloaded concurrently. Requests never block waiting for a free connection.
+_connection_pool_count = 4
+_connection_pool_maxsize = 32
 
-    if normalize(version1) == normalize(version2):
-        return 0
-    elif normalize(version1) > normalize(version2):
-        return 1
-    elif normalize(version1) < normalize(version2):
-        return -1
+# The fault returned by the SOAP API when a request uses an invalid session
+_invalid_session_fault_code = 'axis2ns1:Server'
+_invalid_session_fault_message = 'Internal Error'
+
+
+class SOAPClientCollection(Mapping):
+    """
+    A read-only mapping of SOAP service names to Zeep clients. Building a client requires the service WSDL to be
+        fetched and parsed, so each client is only created the first time it is looked up, and then reused.
+    """
+    base_url: str
+    wsdl_urls: Dict[str, str]
+    transport: Transport
+    settings: Settings
+    plugins: List[Plugin]
+
+    def __init__(self, base_url: str, transport: Transport, settings: Settings, plugins: Optional[List[Plugin]] = None):
+        self.base_url = base_url
+        self.transport = transport
+        self.settings = settings
+        self.plugins = plugins if plugins is not None else []
+        self._clients: Dict[str, Client] = {}
+
+        # Held while clients are built, so that threads sharing the collection don't build the same client twice
+        self._clients_lock = threading.Lock()
+
+        # Build the full WSDL URL for each service up front
+        self.wsdl_urls = {service: base_url + wsdl for service, wsdl in soap_service_wsdls.items()}
+
+    def __getitem__(self, service: str) -> Client:
+        client = self._clients.get(service)
+        if client is None:
+            with self._clients_lock:
+                # Another thread may have built the client while this one was waiting for the lock
+                client = self._clients.get(service)
+                if client is None:
+                    # Raises a KeyError for unknown services, the same as a regular dict would
+                    client = self._build_client(self.wsdl_urls[service])
+                    self._clients[service] = client
+        return client
+
+    def _build_client(self, wsdl_url: str) -> Client:
+        """
+        Create a Zeep client for a SOAP service. This fetches and parses the service WSDL.
+        :param wsdl_url: The URL of the service WSDL.
+        :return: The new client.
+        """
+        return Client(wsdl_url, transport=self.transport, settings=self.settings, plugins=self.plugins)
+
+    def preload(self, services: Optional[List[str]] = None):
+        """
+        Build the clients for several services at once. Fetching and parsing each WSDL is independent, so the clients
+            are built concurrently.
+        :param services: A list of the names of the services to build clients for. Set to None to build clients for
+            every service.
+        """
+        if services is None:
+            services = list(self.wsdl_urls)
+
+        # Raise a KeyError for unknown services, the same as a lookup would
+        for service in services:
+            if service not in self.wsdl_urls:
+                raise KeyError(service)
+
+        with self._clients_lock:
+            # Skip any clients that have already been built
+            pending_services = [service for service in services if service not in self._clients]
+            if len(pending_services) == 0:
+                return
+
+            with ThreadPoolExecutor(max_workers=len(pending_services)) as executor:
+                futures = {service: executor.submit(self._build_client, self.wsdl_urls[service])
+                           for service in pending_services}
+
+                for service, future in futures.items():
+                    self._clients[service] = future.result()
+
+    def clear(self):
+        """
+        Discard all of the clients that have been built, releasing their parsed WSDLs.
+        """
+        with self._clients_lock:
+            self._clients.clear()
+
+    def __contains__(self, service) -> bool:
+        return service in self.wsdl_urls
+
+    def __iter__(self):
+        return iter(self.wsdl_urls)
+
+    def __len__(self):
+        return len(self.wsdl_urls)
 
 
 class ISIMApplication:
     host: str
     port: int
     user: ISIMApplicationUser
-    clients: Dict
+    clients: SOAPClientCollection
     soap_session: object
+    _session: Session
     version: str
+    _version_tuple: tuple
     root_dn: str
 
-    def __init__(self, hostname: str, root_dn: str, user: ISIMApplicationUser, port: int = 9082):
+    def __init__(self, hostname: str, root_dn: str, user: ISIMApplicationUser, port: int = 9082,
+                 preload_clients: bool = False, wsdl_cache: Union[bool, str, BaseCache, None] = True):
+        """
+        Connect to the ISIM application and establish a SOAP session.
+        :param hostname: The hostname of the ISIM application server.
+        :param root_dn: The DN of the root container, e.g. "ou=demo,dc=com".
+        :param user: The ISIMApplicationUser to authenticate as.
+        :param port: The port of the SOAP web services.
+        :param preload_clients: Set to True to build the clients for all SOAP services concurrently when connecting,
+            rather than building each one the first time it is used.
+        :param wsdl_cache: Where to cache the WSDL and XSD documents fetched from the server. Set to True to use an
+            SQLite database in Zeep's default location, to a path to use an SQLite database at that path, or to a Zeep
+            cache object to use it directly. Set to None to fetch the documents from the server every time a client is
+            built. If the SQLite database can't be created, the documents aren't cached.
+        """
         self.logger = logging.getLogger(__name__)
         self.logger.debug('Creating an ISIMApplication')
         if isinstance(port, str):
@@ -158,45 +438,57 @@ class ISIMApplication:
         # Disable SSL validation
         session = Session()
         session.verify = False
-        transport = Transport(session=session)
+
+        # SOAP envelopes are verbose XML, so make sure that the server is allowed to compress responses
+        session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+
+        # Retry requests that fail because a connection couldn't be established, e.g. when a pooled keep-alive
+        # connection has been dropped. SOAP operations are sent as POST requests and may not be idempotent, so only
+        # GET requests (such as WSDL fetches) are retried after a read error or gateway error response.
+        retry = Retry(total=3,
+                      connect=3,
+                      read=3,
+                      status=3,
+                      backoff_factor=0.3,
+                      status_forcelist=(502, 503, 504),
+                      allowed_methods=frozenset(['GET']),
+                      raise_on_status=False)
+
+        # Keep connections to the server alive so that they can be reused by all of the SOAP service clients
+        session.mount("https://", HTTPAdapter(pool_connections=_connection_pool_count,
+                                              pool_maxsize=_connection_pool_maxsize,
+                                              pool_block=False,
+                                              max_retries=retry))
+
+        self._session = session
+
+        # Cache the WSDL and XSD documents so that they are only fetched from the server once a day
+        transport = Transport(session=session, cache=self._build_wsdl_cache(wsdl_cache))
 
         settings = Settings(strict=False)
-        base_url = "https://" + self.host + ":" + str(self.port) + "/itim/services/"
+        base_url = "https://{0}:{1}/itim/services/".format(self.host, self.port)
 
         session_response = None
 
-        self._suppress_ssl_warning()  # suppress SSL warnings
+        # Only log the raw SOAP envelopes when debug logging is enabled
+        if self.logger.isEnabledFor(logging.DEBUG):
+            plugins = [ZeepLoggingPlugin()]
+        else:
+            plugins = []
+
+        # Create a client collection for the SOAP services. Each client is only built the first time it is used.
+        self.clients = SOAPClientCollection(base_url=base_url, transport=transport, settings=settings,
+                                            plugins=plugins)
+
+        # Cache of references to SOAP operations, keyed by service and operation name
+        self._operations: Dict[Tuple[str, str], Callable] = {}
+
+        # Cache of SOAP types, keyed by service and type name
+        self._soap_types: Dict[Tuple[str, str], object] = {}
 
         try:
-            # Create client objects for each SOAP service
-            self.clients: Dict[str, Client] = {
-                "WSSessionService": Client(base_url + "WSSessionService?WSDL",
-                                           transport=transport, settings=settings, plugins=[ZeepLoggingPlugin()]),
-                "WSOrganizationalContainerService": Client(base_url + "WSOrganizationalContainerServiceService?WSDL",
-                                                           transport=transport, settings=settings,
-                                                           plugins=[ZeepLoggingPlugin()]),
-                "WSPersonService": Client(base_url + "WSPersonServiceService?WSDL",
-                                          transport=transport, settings=settings, plugins=[ZeepLoggingPlugin()]),
-                "WSAccountService": Client(base_url + "WSAccountServiceService?WSDL",
-                                           transport=transport, settings=settings, plugins=[ZeepLoggingPlugin()]),
-                "WSRoleService": Client(base_url + "WSRoleServiceService?WSDL",
-                                        transport=transport, settings=settings, plugins=[ZeepLoggingPlugin()]),
-                "WSServiceService": Client(base_url + "WSServiceServiceService?WSDL",
-                                           transport=transport, settings=settings, plugins=[ZeepLoggingPlugin()]),
-                "WSProvisioningPolicyService": Client(base_url + "WSProvisioningPolicyServiceService?WSDL",
-                                                      transport=transport, settings=settings,
-                                                      plugins=[ZeepLoggingPlugin()]),
-                "WSPasswordService": Client(base_url + "WSPasswordServiceService?WSDL",
-                                            transport=transport, settings=settings, plugins=[ZeepLoggingPlugin()]),
-                "WSRequestService": Client(base_url + "WSRequestServiceService?WSDL",
-                                           transport=transport, settings=settings, plugins=[ZeepLoggingPlugin()]),
-                "WSSystemUserService": Client(base_url + "WSSystemUserServiceService?WSDL",
-                                              transport=transport, settings=settings, plugins=[ZeepLoggingPlugin()]),
-                "WSGroupService": Client(base_url + "WSGroupServiceService?WSDL",
-                                         transport=transport, settings=settings, plugins=[ZeepLoggingPlugin()]),
-                "WSSearchDataService": Client(base_url + "WSSearchDataServiceService?WSDL",
-                                              transport=transport, settings=settings, plugins=[ZeepLoggingPlugin()])
-            }
+            if preload_clients:
+                self.clients.preload()
 
             # Establish a session
             session_response = self.clients["WSSessionService"].service.login(user.username, user.password)
@@ -215,8 +507,54 @@ class ISIMApplication:
         # Retrieve version info
         version_info = self.clients["WSSessionService"].service.getItimVersionInfo()
         self.version = version_info["version"] + "." + version_info["fixPackLevel"]
+        self._version_tuple = _normalize_version(self.version)
 
-    def retrieve_soap_type(self, service: str, type_name: str, requires_version=None, warnings=[], ignore_error=False):
+    def _build_wsdl_cache(self, wsdl_cache: Union[bool, str, BaseCache, None]) -> Optional[BaseCache]:
+        """
+        Create the cache used by the Zeep transport for WSDL and XSD documents.
+        :param wsdl_cache: The wsdl_cache argument passed to the constructor.
+        :return: A Zeep cache object, or None if the documents shouldn't be cached.
+        """
+        if wsdl_cache is None or wsdl_cache is False:
+            return None
+        if isinstance(wsdl_cache, BaseCache):
+            return wsdl_cache
+
+        # A path of None makes Zeep use it's default location
+        path = None if wsdl_cache is True else wsdl_cache
+        try:
+            return SqliteCache(path=path, timeout=_wsdl_cache_timeout)
+        except (sqlite3.Error, OSError) as e:
+            # The cache only saves fetching the documents again, so a database that can't be created, e.g. in a
+            # read-only home directory, shouldn't prevent a connection from being made
+            self.logger.warning("Unable to create the WSDL cache, so WSDL documents won't be cached: %s", e)
+            return None
+
+    def close(self):
+        """
+        Log out of the SOAP session and release the connections and clients held by this ISIMApplication. It can't be
+            used to make further calls once it is closed.
+        """
+        if self.soap_session is not None:
+            try:
+                self.clients["WSSessionService"].service.logout(self.soap_session)
+            except (requests.exceptions.ConnectionError, Fault):
+                self.logger.debug("Failed to log out of the SOAP session.")
+            self.soap_session = None
+
+        self._operations.clear()
+        self._soap_types.clear()
+        self.clients.clear()
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def retrieve_soap_type(self, service: str, type_name: str, requires_version=None, warnings=None,
+                           ignore_error=False):
         """
         Get the SOAP type of the specified name from the specified service. This function returns a response object
         so that the calling function can process it the same way as other calls to this class, even though it does
@@ -242,10 +580,80 @@ class ISIMApplication:
         if return_obj['rc'] == 1:
             return return_obj
 
+        type_result = self._lookup_soap_type(service, type_name, return_obj, ignore_error=ignore_error)
+        if return_obj['rc'] != 0:
+            return return_obj
+
+        return_obj['data'] = type_result
+        return_obj['rc'] = 0
+        return_obj['changed'] = False
+        return return_obj
+
+    def retrieve_soap_types(self, service: str, type_names: List[str], requires_version=None, warnings=None,
+                            ignore_error=False):
+        """
+        Get several SOAP types from the specified service at once. This behaves the same way as retrieve_soap_type(),
+        but the version requirement is only checked once for all of the types.
+        :param service: The name of the SOAP web service to use.
+        :param type_names: A list of the names of the SOAP types to retrieve, including the namespace (e.g.
+            ['ns1:WSPerson', 'ns1:WSAttribute']).
+        :param requires_version: The version required by the call.
+        :param warnings: The current list of warnings for the call.
+        :param ignore_error: Set to True if errors should be ignored.
+        :return: An IBMResponse object with a list of the SOAP types in the data attribute, in the same order as
+            type_names.
+        """
+
+        # Log the description
+        self._log_description("Retrieving the SOAP types " +
+                              ", ".join("'" + type_name + "'" for type_name in type_names) +
+                              " from the " + service + " service.")
+
+        # Update the list of warnings
+        warnings = self._process_warnings(warnings=warnings)
+        return_obj = create_return_object(warnings=warnings)
+
+        # Check the minimum version requirement is met
+        self._check_version(return_obj, requires_version, ignore_error=ignore_error)
+        if return_obj['rc'] == 1:
+            return return_obj
+
+        type_results = []
+        for type_name in type_names:
+            type_result = self._lookup_soap_type(service, type_name, return_obj, ignore_error=ignore_error)
+            if return_obj['rc'] != 0:
+                return return_obj
+            type_results.append(type_result)
+
+        return_obj['data'] = type_results
+        return_obj['rc'] = 0
+        return_obj['changed'] = False
+        return return_obj
+
+    def _lookup_soap_type(self, service: str, type_name: str, return_obj, ignore_error=False):
+        """
+        Look up a SOAP type in the schema of the specified service. Types are static for a given WSDL, so each one only
+        needs to be looked up once.
+        :param service: The name of the SOAP web service to use.
+        :param type_name: The name of the SOAP type to retrieve, including the namespace (e.g. 'ns1:WSPerson').
+        :param return_obj: The IBMResponse object for the call. If an error is ignored, it's return code will be set to
+            a non-zero value.
+        :param ignore_error: Set to True if errors should be ignored.
+        :return: The SOAP type, or None if an error was ignored.
+        """
+        type_result = self._soap_types.get((service, type_name))
+        if type_result is not None:
+            return type_result
+
         # Attempt to retrieve the required type
-        type_result = None
         try:
             type_result = self.clients[service].get_type(type_name)
+
+        # handle any connection errors. The client for the service may need to fetch it's WSDL before it can be used.
+        except requests.exceptions.ConnectionError:
+            self._process_connection_error(ignore_error=ignore_error, return_obj=return_obj)
+            return None
+
         except (zeep.exceptions.LookupError, zeep.exceptions.NamespaceError, ValueError):
             error_message = type_name + " is  not a valid namespace and type for the " + service + " service."
             if not ignore_error:
@@ -254,12 +662,10 @@ class ISIMApplication:
             else:
                 self.logger.debug(error_message)
                 return_obj['rc'] = 1
-                return return_obj
+                return None
 
-        return_obj['data'] = type_result
-        return_obj['rc'] = 0
-        return_obj['changed'] = False
-        return return_obj
+        self._soap_types[(service, type_name)] = type_result
+        return type_result
 
     def invoke_soap_request(self,
                             description: str,
@@ -267,8 +673,9 @@ class ISIMApplication:
                             operation: str,
                             data: List,
                             requires_version=None,
-                            warnings=[],
-                            ignore_error=False):
+                            warnings=None,
+                            ignore_error=False,
+                            raw=False):
         """
         Make a SOAP call to the application and perform all associated functions (logging, assessing any warnings,
         adding metadata to the response object, and handling connection errors)
@@ -279,6 +686,9 @@ class ISIMApplication:
         :param requires_version: The version required by the call.
         :param warnings: The current list of warnings for the call.
         :param ignore_error: Set to True if errors should be ignored.
+        :param raw: Set to True to return the Zeep objects in the data field as they are, rather than serializing them
+            into Python dicts and lists. This avoids walking large responses when only a few fields will be read, but
+            the result can't be returned to Ansible.
         :return: An IBMResponse object containing the following fields: {'rc', 'data', 'changed', 'warnings'}.
         """
 
@@ -297,15 +707,17 @@ class ISIMApplication:
         if return_obj['rc'] == 1:
             return return_obj
 
-        self._suppress_ssl_warning()  # suppress SSL warnings
-
         soap_data = None
         soap_fault = None
 
         # Make the call to the soap service and get the response
         try:
             # Get a reference to the function to call. See https://stackoverflow.com/a/3071 for an explanation.
-            function_pointer = getattr(self.clients[service].service, operation)
+            # Zeep creates a new operation proxy on each attribute lookup, so the references are cached.
+            function_pointer = self._operations.get((service, operation))
+            if function_pointer is None:
+                function_pointer = getattr(self.clients[service].service, operation)
+                self._operations[(service, operation)] = function_pointer
             soap_data = function_pointer(self.soap_session, *data)  # soap_data is an arbitrary Python data structure
 
         # handle any connection errors
@@ -313,34 +725,30 @@ class ISIMApplication:
             self._process_connection_error(ignore_error=ignore_error, return_obj=return_obj)
 
         # Record any SOAP fault that occurred during the call.
-        except zeep.exceptions.Fault as fault:
-            soap_fault = {'code': fault.code, 'message': fault.message, 'detail': {}}
-            if fault.detail is not None:
-                detail_keys = fault.detail.keys()
+        except Fault as fault:
+            code, message, detail = fault.code, fault.message, fault.detail
+            soap_fault = {'code': code, 'message': message, 'detail': {}}
+
+            # The fault detail is usually empty, so only look up the service types when there is something to
+            # deserialize
+            detail_keys = detail.keys() if detail is not None else None
+            if detail_keys:
+                types = self.clients[service].wsdl.types
                 for key in detail_keys:
-                    soap_fault['detail'][key] = self.clients[service].wsdl.types.deserialize(fault.detail[key])
+                    soap_fault['detail'][key] = types.deserialize(detail[key])
 
         # Record whether the call resulted in a change
-        # Anything other than methods with these prefixes should result in a change
-        if not operation.lower().startswith(("get", "is", "login", "logout", "search", "lookup", "test", "find")):
+        if not _is_read_only_operation(operation):
             return_obj['changed'] = True
 
         # Process the response or fault
-        self._process_response(return_obj, soap_data, soap_fault, ignore_error=ignore_error)
+        self._process_response(return_obj, soap_data, soap_fault, ignore_error=ignore_error, raw=raw)
 
         # log the response
         self._log_response(return_obj)
 
         return return_obj
 
-    def _suppress_ssl_warning(self):
-        # Disable https warning because of non-standard certs on appliance
-        try:
-            self.logger.debug("Suppressing SSL Warnings.")
-            requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
-        except AttributeError:
-            self.logger.warning("load requests.packages.urllib3.disable_warnings() failed")
-
     # log a request
     def _log_request(self, service, method, description):
         self.logger.debug("Request: %s.%s Description: %s", service, method, description)
@@ -348,16 +756,20 @@ class ISIMApplication:
     # log the description of a task
     def _log_description(self, description):
         if description != "":
-            self.logger.info('*** ' + description + ' ***')
+            self.logger.info('*** %s ***', description)
 
-    def _process_warnings(self, warnings: List = []):
+    def _process_warnings(self, warnings: Optional[List] = None):
         """
         Update the list of warnings for a request before a call to the SOAP API is made. At this stage this method is
         just a placeholder for any future warning conditions that may need ot be addressed.
         :param warnings: The current list of warnings for the call.
         :return: The updated list of warnings.
         """
-        self.logger.debug("Warnings: {0}".format(warnings))
+        if warnings is None:
+            return []
+
+        if warnings:
+            self.logger.debug("Warnings: %s", warnings)
         return warnings
 
     def _check_version(self, return_obj, requires_version, ignore_error=False):
@@ -368,7 +780,7 @@ class ISIMApplication:
         :param ignore_error: A flag which is set to True if errors should be ignored.
         :return: A flag that is True if the application version is sufficient or can't be determined.
         """
-        self.logger.debug("Checking for minimum version: {0}.".format(requires_version))
+        self.logger.debug("Checking for minimum version: %s.", requires_version)
         if not self._is_version_supported(requires_version):
             error_message = "API invoked requires minimum version: {0}, application is of lower version: {1}.".format(
                 requires_version, self.version)
@@ -387,7 +799,8 @@ class ISIMApplication:
         :return: A flag that is True if the application version is sufficient or can't be determined.
         """
         if requires_version is not None and self.version is not None:
-            if version_compare(self.version, requires_version) < 0:
+            # Compare against the version parsed when the application was created
+            if self._version_tuple < _normalize_version(requires_version):
                 return False
         return True
 
@@ -404,7 +817,7 @@ class ISIMApplication:
             self.logger.debug("Failed to connect to server.")
             return_obj['rc'] = 502  # setting the response code will prevent any further processing of the response
 
-    def _process_response(self, return_obj, zeep_response, soap_fault, ignore_error):
+    def _process_response(self, return_obj, zeep_response, soap_fault, ignore_error, raw=False):
         """
         Common soap_fault objects:
         Bad attribute values in an object, like an invalid session ID:
@@ -453,35 +866,47 @@ class ISIMApplication:
         # are assumed to produce 500 status codes in accordance with the SOAP standard.
         if soap_fault is None:
             return_obj['rc'] = 0
-            self.logger.debug("Request succeeded: ")
-            self.logger.debug("     Status Code: 200")
-            self.logger.debug("     Text: " + str(zeep_response))
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Request succeeded: ")
+                self.logger.debug("     Status Code: 200")
+                self.logger.debug("     Text: %s", zeep_response)
         else:
             return_obj['rc'] = 500
 
             self.logger.error("Request failed: ")
             self.logger.error("     Status Code: 500")
-            self.logger.error("     Fault Code: " + soap_fault['code'])
-            self.logger.error("     Fault Message: " + soap_fault['message'])
+            fault_code = soap_fault['code']
+            fault_message = soap_fault['message']
+
+            self.logger.error("     Fault Code: %s", fault_code)
+            self.logger.error("     Fault Message: %s", fault_message)
 
             # in the event of an invalid session ID, unconditionally raise an exception to abort execution
-            if soap_fault['code'] == 'axis2ns1:Server' and soap_fault['message'] == 'Internal Error':
-                raise IBMFatal("HTTP Return code: 500. Fault message: " + soap_fault[
-                    'message'] + "\n This can be caused by an invalid session with the server, or using invalid "
-                                 "parameter values in the request.")
+            if fault_code == _invalid_session_fault_code and fault_message == _invalid_session_fault_message:
+                raise IBMFatal("HTTP Return code: 500. Fault message: " + fault_message +
+                               "\n This can be caused by an invalid session with the server, or using invalid "
+                               "parameter values in the request.")
 
             if not ignore_error:
-                raise IBMError("HTTP Return code: 500. Fault message: " + soap_fault['message'])
+                raise IBMError("HTTP Return code: 500. Fault message: " + str(fault_message))
             return_obj['changed'] = False  # force changed to be False as there is an error
 
-        return_obj['data'] = zeep.helpers.serialize_object(zeep_response)
+        if raw:
+            return_obj['data'] = zeep_response
+        else:
+            # The response is only serialized when the data is accessed
+            return_obj.set_unserialized_data(zeep_response)
 
     def _log_response(self, response):
         """
         Log an IBMResponse.
         :param response: An IBMResponse object to log.
         """
+        # Converting a response to a string serializes it's data, so only do it if the result will be logged
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+
         if response:
-            self.logger.debug("Response: " + str(response))
+            self.logger.debug("Response: %s", response)
         else:
             self.logger.debug("Response: None")
@@ -1,10 +1,15 @@
-from typing import List, Dict, Optional
-from collections import Counter
+from typing import List, Dict, Optional, NamedTuple, Tuple, Callable
 import logging
+import functools
+import copy
+import weakref
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from zeep.helpers import serialize_object
 from isimws.application.isimapplication import ISIMApplication, IBMResponse, create_return_object
-from isimws.utilities.tools import build_attribute, get_soap_attribute, strip_zeep_element_data
+from isimws.utilities.tools import build_attribute, get_soap_attribute, strip_zeep_element_data, gather_responses
 from isimws.utilities.dnencoder import DNEncoder
-import isimws
 
 logger = logging.getLogger(__name__)
 
@@ -14,11 +19,63 @@ soap_service = "WSOrganizationalContainerService"
 # minimum version required by this module
 requires_version = None
 
+# Set to False to resolve the DNs used by apply one at a time, rather than concurrently
+parallel_lookups = True
+
+# The number of DN lookups that apply sends to the server concurrently
+_lookup_workers = 2
+
+
+class _ContainerProfile(NamedTuple):
+    """
+    Describes how the attributes of a container profile are set.
+    """
+    prefix: str  # the prefix used for the profile in container paths
+    name_attribute: str  # the attribute holding the container name
+    has_description: bool  # whether the profile has a description
+    people_attribute: Optional[str]  # the attribute holding the associated people, if any
+    all_people: bool  # whether the people attribute holds all of the associated people, or just the first one
+
+
+# Maps each valid container profile to it's description
+_container_profiles = {
+    "Organization": _ContainerProfile('o', 'o', True, None, False),
+    "OrganizationalUnit": _ContainerProfile('ou', 'ou', True, 'erSupervisor', False),
+    "BPOrganization": _ContainerProfile('bp', 'ou', False, 'erSponsor', False),
+    "Location": _ContainerProfile('lo', 'l', True, 'erSupervisor', False),
+    "AdminDomain": _ContainerProfile('ad', 'ou', True, 'erAdministrator', True)
+}
+
+# The profile names expected by the SOAP API when creating a container, where they differ from the profile names used
+# everywhere else
+_create_profile_names = {
+    "BPOrganization": "BusinessPartnerOrganization",
+    "AdminDomain": "SecurityDomain"
+}
+
+# Containers retrieved by get, keyed by the ISIMApplication instance and then by the lower case DN of each container.
+# Many objects are often created under the same container, so this avoids looking it up again for each one. Each entry
+# holds the time it expires and the container object. Containers are retrieved concurrently by apply, so the cache is
+# guarded by a lock.
+_container_cache = weakref.WeakKeyDictionary()
+_container_cache_lock = threading.Lock()
+
+# The number of seconds a container retrieved by get is reused for
+_container_cache_ttl = 60
+
+# Existing containers found by apply, keyed by the ISIMApplication instance and then by the parent container path,
+# profile, and name of each container. This allows repeated check mode runs to skip looking up the same containers.
+# Each entry holds the time it expires and the container object, or None if the container didn't exist. Entries expire
+# after _container_cache_ttl seconds, and are guarded by _container_cache_lock.
+_existing_container_cache = weakref.WeakKeyDictionary()
+
 
 def search(isim_application: ISIMApplication,
            parent_dn: str,
            container_name: str,
            profile: str,
+           parent_container_object: Optional[Dict] = None,
+           skip_container_lookup=False,
            check_mode=False,
            force=False) -> IBMResponse:
     """
@@ -32,51 +89,103 @@ def search(isim_application: ISIMApplication,
     :param container_name: The name of the container to search for.
     :param profile: The type of container to search for. Valid values are 'Organization', 'OrganizationalUnit',
         'BPOrganization', 'Location', or 'AdminDomain'.
+    :param parent_container_object: The parent container object, if it has already been retrieved. If it is not
+        provided, it will be retrieved using parent_dn.
+    :param skip_container_lookup: Set to True to identify the parent container by it's DN alone, rather than
+        retrieving it from the server first. The parent container isn't checked for existence.
     :param check_mode: Set to True to enable check mode.
     :param force: Set to True to force execution regardless of current state.
     :return: An IBMResponse object. If the call was successful, the data field will contain a list of the Python dict
-        representations of each role matching the filter.
+        representations of each container matching the filter.
     """
+    # Validate the profile before making any calls to the server
+    _validate_profile(profile)
+
     # The session object is handled by the ISIMApplication instance
     data = []
 
-    # Retrieve the parent container object
-    container_response = isimws.isim.container.get(isim_application=isim_application, container_dn=parent_dn)
+    # Retrieve the parent container object if it wasn't provided
+    if parent_container_object is None:
+        if skip_container_lookup:
+            container_response = get_reference(isim_application=isim_application, container_dn=parent_dn)
+        else:
+            container_response = get(isim_application=isim_application, container_dn=parent_dn)
 
-    # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
-    if container_response['rc'] != 0:
-        return container_response
+        # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
+        if container_response['rc'] != 0:
+            return container_response
 
-    container_object = container_response['data']
-    data.append(container_object)
+        parent_container_object = container_response['data']
+
+    data.append(parent_container_object)
 
     # Add the container profile name to the request
-    if not (profile == "Organization" or
-            profile == "OrganizationalUnit" or
-            profile == "Location" or
-            profile == "AdminDomain" or
-            profile == "BPOrganization"):
-        raise ValueError("'" + profile + "' is not a valid container profile. Valid values are 'Organization', "
-                                         "'OrganizationalUnit', 'BPOrganization', 'Location', or 'AdminDomain'.")
     data.append(profile)
 
     # Add the container name to the request
     data.append(container_name)
 
-    # Invoke the call
+    # Invoke the call. The raw Zeep objects are returned so that the raw elements of each child container can be
+    # skipped while the containers are serialized, rather than being serialized and then stripped back out.
     ret_obj = isim_application.invoke_soap_request("Searching for containers",
                                                    soap_service,
                                                    "searchContainerByName",
                                                    data,
-                                                   requires_version=requires_version)
+                                                   requires_version=requires_version,
+                                                   raw=True)
 
-    ret_obj = strip_zeep_element_data(ret_obj)
+    if ret_obj['rc'] == 0:
+        ret_obj['data'] = [_project_container(container) for container in ret_obj['data'] or []]
 
     return ret_obj
 
 
+def _project_container(container) -> Dict:
+    """
+    Convert a container returned by the SOAP API into a Python dict. The result is the same as serializing the whole
+        container and then passing it to strip_zeep_element_data.
+    :param container: The Zeep object representing the container.
+    :return: The Python dict representation of the container, without the raw Zeep elements of it's child containers.
+    """
+    fields = {field: container[field] for field in container}
+
+    # The raw Zeep elements of each child container can't be returned to Ansible, so they are left out
+    children = fields.get('children')
+    if children is not None and children['item'] is not None:
+        fields['children'] = {'item': [{key: child[key] for key in child if key != '_raw_elements'}
+                                       for child in children['item']]}
+
+    return serialize_object(fields)
+
+
 # Get a container by it's DN
-def get(isim_application: ISIMApplication, container_dn: str, check_mode=False, force=False) -> IBMResponse:
+def get(isim_application: ISIMApplication,
+        container_dn: str,
+        use_cache=True,
+        check_mode=False,
+        force=False) -> IBMResponse:
+    """
+    Get a container by it's DN.
+    :param isim_application: The ISIMApplication instance to connect to.
+    :param container_dn: The DN of the container to retrieve.
+    :param use_cache: Set to False to always retrieve the container from the server, rather than reusing a container
+        that was retrieved with the same ISIMApplication instance in the last _container_cache_ttl seconds.
+    :param check_mode: Set to True to enable check mode.
+    :param force: Set to True to force execution regardless of current state. The container will always be retrieved
+        from the server, and the cached copy will be refreshed.
+    :return: An IBMResponse object. If the call was successful, the data field will contain the Python dict
+        representation of the container.
+    """
+    cache_key = container_dn.lower()
+
+    if use_cache and not force:
+        with _container_cache_lock:
+            cache_entry = _container_cache.get(isim_application, {}).get(cache_key)
+
+        # Callers are free to modify the returned data, so each caller gets it's own copy of the cached container
+        if cache_entry is not None and cache_entry[0] > time.monotonic():
+            return create_return_object(data=copy.deepcopy(cache_entry[1]))
+
     # The session object is handled by the ISIMApplication instance
     # Add the dn string
     data = [container_dn]
@@ -88,9 +197,122 @@ def get(isim_application: ISIMApplication, container_dn: str, check_mode=False,
                                                    data,
                                                    requires_version=requires_version)
 
+    if ret_obj['rc'] == 0:
+        with _container_cache_lock:
+            application_cache = _container_cache.setdefault(isim_application, {})
+            application_cache[cache_key] = (time.monotonic() + _container_cache_ttl, copy.deepcopy(ret_obj['data']))
+
     return ret_obj
 
 
+def get_reference(isim_application: ISIMApplication, container_dn: str) -> IBMResponse:
+    """
+    Get an object that can be passed to the SOAP API in place of a container, without making any calls to the server.
+    Operations that take a container argument only use it's DN to identify it, so the full container is only needed
+    when the caller wants to confirm that the container exists.
+    :param isim_application: The ISIMApplication instance to connect to.
+    :param container_dn: The DN of the container.
+    :return: An IBMResponse object. The data field will contain the Python dict representation of the container if it
+        was retrieved by get in the last _container_cache_ttl seconds, or otherwise a dict containing only it's DN.
+    """
+    with _container_cache_lock:
+        cache_entry = _container_cache.get(isim_application, {}).get(container_dn.lower())
+
+    if cache_entry is not None and cache_entry[0] > time.monotonic():
+        return create_return_object(data=copy.deepcopy(cache_entry[1]))
+
+    return create_return_object(data={'itimDN': container_dn})
+
+
+def get_many(isim_application: ISIMApplication,
+             container_dns: List[str],
+             max_workers: int = 8,
+             check_mode=False,
+             force=False) -> IBMResponse:
+    """
+    Get several containers by their DNs. The containers are retrieved concurrently.
+    :param isim_application: The ISIMApplication instance to connect to.
+    :param container_dns: A list of the DNs of the containers to retrieve.
+    :param max_workers: The maximum number of requests to send to the server at the same time.
+    :param check_mode: Set to True to enable check mode.
+    :param force: Set to True to force execution regardless of current state.
+    :return: An IBMResponse object. If the calls were successful, the data field will contain a list of the Python dict
+        representations of each container, in the same order as container_dns.
+    """
+    return gather_responses([functools.partial(get,
+                                               isim_application=isim_application,
+                                               container_dn=container_dn,
+                                               force=force)
+                             for container_dn in container_dns],
+                            max_workers=max_workers)
+
+
+def search_many(isim_application: ISIMApplication,
+                searches: List[tuple],
+                max_workers: int = 8,
+                check_mode=False,
+                force=False) -> IBMResponse:
+    """
+    Perform several container searches concurrently. Each distinct parent container is only retrieved once, and
+        duplicate searches are only sent to the server once.
+    :param isim_application: The ISIMApplication instance to connect to.
+    :param searches: A list of tuples containing the parent DN, container name, and profile for each search. See the
+        search function for the expected format of each value.
+    :param max_workers: The maximum number of requests to send to the server at the same time.
+    :param check_mode: Set to True to enable check mode.
+    :param force: Set to True to force execution regardless of current state.
+    :return: An IBMResponse object. If the calls were successful, the data field will contain a list of the results of
+        each search, in the same order as the searches argument.
+    """
+    # Validate all of the profiles before making any calls to the server
+    for parent_dn, container_name, profile in searches:
+        _validate_profile(profile)
+
+    # DNs aren't case sensitive, so searches that only differ by the case of the parent DN are treated as duplicates
+    search_keys = [(parent_dn.lower(), container_name, profile) for parent_dn, container_name, profile in searches]
+    distinct_searches = {}
+    for key, search_args in zip(search_keys, searches):
+        distinct_searches.setdefault(key, search_args)
+
+    # Retrieve the parent containers first, so that concurrent searches under the same parent don't all look it up
+    parent_dns = list({parent_dn.lower(): parent_dn for parent_dn, container_name, profile in searches}.values())
+    parents_response = get_many(isim_application=isim_application, container_dns=parent_dns, max_workers=max_workers)
+
+    # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
+    if parents_response['rc'] != 0:
+        return parents_response
+    parent_objects = {parent_dn.lower(): parent for parent_dn, parent in zip(parent_dns, parents_response['data'])}
+
+    ret_obj = gather_responses([functools.partial(search,
+                                                  isim_application=isim_application,
+                                                  parent_dn=parent_dn,
+                                                  container_name=container_name,
+                                                  profile=profile,
+                                                  parent_container_object=parent_objects[key[0]])
+                                for key, (parent_dn, container_name, profile) in distinct_searches.items()],
+                               max_workers=max_workers)
+
+    # Fan the results back out to each of the original searches
+    if ret_obj['rc'] == 0:
+        results = dict(zip(distinct_searches, ret_obj['data']))
+        ret_obj['data'] = [results[key] for key in search_keys]
+
+    return ret_obj
+
+
+def _invalidate_cached_container(isim_application: ISIMApplication, container_dn: str):
+    """
+    Remove a container from the cache used by get, so that it will be retrieved from the server the next time it is
+        requested.
+    :param isim_application: The ISIMApplication instance the container was retrieved with.
+    :param container_dn: The DN of the container to remove.
+    """
+    with _container_cache_lock:
+        application_cache = _container_cache.get(isim_application)
+        if application_cache is not None:
+            application_cache.pop(container_dn.lower(), None)
+
+
 # Required attributes
 # Organization: organization name (str) [o], description (optional str) [description]
 # Object class: organization
@@ -112,6 +334,35 @@ def get(isim_application: ISIMApplication, container_dn: str, check_mode=False,
 # Object class: organizationalunit
 # Profile name: OrganizationalUnit
 
+def _cache_existing_container(isim_application: ISIMApplication, cache_key: Tuple, existing_container: Optional[Dict]):
+    """
+    Store the result of looking for an existing container in the cache used by apply in check mode.
+    :param isim_application: The ISIMApplication instance the container was looked up with.
+    :param cache_key: A tuple containing the parent container path, profile, and name of the container.
+    :param existing_container: The container that was found, or None if it doesn't exist.
+    """
+    with _container_cache_lock:
+        application_cache = _existing_container_cache.setdefault(isim_application, {})
+        application_cache[cache_key] = (time.monotonic() + _container_cache_ttl, existing_container)
+
+
+def _invalidate_existing_containers(isim_application: ISIMApplication,
+                                    predicate: Callable[[Tuple, Optional[Dict]], bool]):
+    """
+    Remove entries from the cache used by apply in check mode, so that the containers will be looked up on the server
+        the next time they are needed. The cache is keyed by container path, which isn't known when a container is
+        created or modified by DN, so the entries to remove are selected with a predicate instead.
+    :param isim_application: The ISIMApplication instance the containers were looked up with.
+    :param predicate: A function that takes the key and the cached container (or None) of an entry, and returns True if
+        the entry should be removed.
+    """
+    with _container_cache_lock:
+        application_cache = _existing_container_cache.get(isim_application)
+        if application_cache is not None:
+            for cache_key in [key for key, entry in application_cache.items() if predicate(key, entry[1])]:
+                del application_cache[cache_key]
+
+
 def apply(isim_application: ISIMApplication,
           parent_container_path: str,
           profile: str,
@@ -163,19 +414,8 @@ def apply(isim_application: ISIMApplication,
                          "non-empty string values.")
 
     # Validate the selected profile
-    if profile == 'Organization':
-        profile_prefix = 'o'
-    elif profile == 'OrganizationalUnit':
-        profile_prefix = 'ou'
-    elif profile == 'BPOrganization':
-        profile_prefix = 'bp'
-    elif profile == 'Location':
-        profile_prefix = 'lo'
-    elif profile == 'AdminDomain':
-        profile_prefix = 'ad'
-    else:
-        raise ValueError("'" + profile + "' is not a valid container profile. Valid values are 'Organization', "
-                                         "'OrganizationalUnit', 'BPOrganization', 'Location', or 'AdminDomain'.")
+    _validate_profile(profile)
+    profile_prefix = _container_profiles[profile].prefix
 
     # If any values are set to None, they must be replaced with empty values. This is because these values will be
     # passed to methods that interpret None as 'no change', whereas we want them to be explicitly set to empty values.
@@ -185,131 +425,158 @@ def apply(isim_application: ISIMApplication,
     if associated_people is None:
         associated_people = []
 
-    # Convert the parent container path into a DN that can be passed to the SOAP API. This also validates the parent
-    # container path.
     dn_encoder = DNEncoder(isim_application)
-    parent_container_dn = dn_encoder.container_path_to_dn(parent_container_path)
 
-    # Convert the associated people names into DNs that can be passed to the SOAP API
-    # We don't perform this step for an organization as an organization cannot have associated people
-    associated_people_dns = []
+    cache_key = (parent_container_path, profile, name)
+
+    # The associated people are resolved with a single search, and the order of the list is preserved. We don't
+    # resolve them for an organization as an organization cannot have associated people.
+    people_entries = []
     if profile != "Organization":
-        for person in associated_people:
-            associated_people_dns.append(dn_encoder.encode_to_isim_dn(container_path=str(person[0]),
-                                                                      name=str(person[1]),
-                                                                      object_type='person'))
+        people_entries = [(str(person[0]), str(person[1]), 'person') for person in associated_people]
 
-    # Resolve the instance with the specified name in the specified container
-    existing_container = dn_encoder.get_unique_object(container_path=parent_container_path,
-                                                      name=profile_prefix + "::" + name,
-                                                      object_type='container')
+    if parallel_lookups and not check_mode:
+        # Outside of check mode all of the lookups are always needed. The parent container path is resolved first, as
+        # the search for the existing container resolves the same path. Once it is in the DNEncoder's path cache, the
+        # remaining lookups don't depend on each other, so they are sent to the server at the same time.
+        parent_container_dn = dn_encoder.container_path_to_dn(parent_container_path)
 
-    if existing_container is None or force:
-        # If the instance doesn't exist yet, create a new role and return the response
+        with ThreadPoolExecutor(max_workers=_lookup_workers) as executor:
+            existing_container_future = executor.submit(dn_encoder.get_unique_object,
+                                                        container_path=parent_container_path,
+                                                        name=profile_prefix + "::" + name,
+                                                        object_type='container')
+            associated_people_dns_future = executor.submit(dn_encoder.encode_batch_to_isim_dns, people_entries)
+
+            existing_container = existing_container_future.result()
+            associated_people_dns = associated_people_dns_future.result()
+
+        _cache_existing_container(isim_application, cache_key, existing_container)
+    else:
+        # Resolve the instance with the specified name in the specified container. In check mode, a container that was
+        # looked up by an apply call in the last _container_cache_ttl seconds can be reused, as nothing will be changed.
+        cache_entry = None
         if check_mode:
-            return create_return_object(changed=True)
+            with _container_cache_lock:
+                cache_entry = _existing_container_cache.get(isim_application, {}).get(cache_key)
+
+        if cache_entry is not None and cache_entry[0] > time.monotonic():
+            existing_container = cache_entry[1]
         else:
-            ret_obj = _create(
-                isim_application=isim_application,
-                parent_container_dn=parent_container_dn,
-                profile=profile,
-                name=name,
-                description=description,
-                associated_people_dns=associated_people_dns
-            )
-            return strip_zeep_element_data(ret_obj)
+            existing_container = dn_encoder.get_unique_object(container_path=parent_container_path,
+                                                              name=profile_prefix + "::" + name,
+                                                              object_type='container')
+            _cache_existing_container(isim_application, cache_key, existing_container)
+
+        # In check mode, a container that needs to be created will always result in a change, so there is no need to
+        # resolve any other DNs.
+        if (existing_container is None or force) and check_mode:
+            return create_return_object(changed=True)
+
+        # Convert the parent container path into a DN that can be passed to the SOAP API. This also validates the
+        # parent container path.
+        parent_container_dn = dn_encoder.container_path_to_dn(parent_container_path)
+
+        # Convert the associated people names into DNs that can be passed to the SOAP API
+        associated_people_dns = dn_encoder.encode_batch_to_isim_dns(people_entries)
+
+    if existing_container is None or force:
+        # If the instance doesn't exist yet, create a new container and return the response. Check mode has already
+        # been handled above.
+
+        # The parent container was already retrieved while searching for the existing container
+        ret_obj = _create(
+            isim_application=isim_application,
+            parent_container_dn=parent_container_dn,
+            parent_container_object=dn_encoder.get_container(parent_container_dn),
+            profile=profile,
+            name=name,
+            description=description,
+            associated_people_dns=associated_people_dns
+        )
+        return strip_zeep_element_data(ret_obj)
     else:
         # If an existing instance was found, compare it's attributes with the requested attributes and determine if a
         # modify operation is required.
-        modify_required = False
+        changes = _compute_changes(existing_container, profile, description, associated_people_dns)
 
-        existing_description = get_soap_attribute(existing_container, 'description')
+        if not changes:
+            return create_return_object(changed=False)
 
-        if (profile == "Organization" or
-                profile == "OrganizationalUnit" or
-                profile == "Location" or
-                profile == "AdminDomain"):
-
-            if existing_description is None:
-                if description != '':
-                    modify_required = True
-                else:
-                    description = None  # set to None so that no change occurs
-            elif description != existing_description[0]:
-                modify_required = True
-            else:
-                description = None  # set to None so that no change occurs
-        else:
-            description = None  # set to None so that no change occurs
+        if check_mode:
+            return create_return_object(changed=True)
 
-        existing_supervisor = get_soap_attribute(existing_container, 'erSupervisor')
-        existing_sponsor = get_soap_attribute(existing_container, 'erSponsor')
-        existing_administrators = get_soap_attribute(existing_container, 'erAdministrator')
+        ret_obj = _modify(
+            isim_application=isim_application,
+            container_dn=existing_container['itimDN'],
+            profile=profile,
+            **changes
+        )
+        return strip_zeep_element_data(ret_obj)
 
-        if (profile == "OrganizationalUnit" or
-                profile == "Location"):
 
-            if associated_people_dns == []:
-                new_supervisor = ''
-            else:
-                new_supervisor = associated_people_dns[0]
-
-            if existing_supervisor is None:
-                if new_supervisor != '':
-                    modify_required = True
-                else:
-                    associated_people_dns = None  # set to None so that no change occurs
-            elif new_supervisor != existing_supervisor[0]:
-                modify_required = True
-            else:
-                associated_people_dns = None  # set to None so that no change occurs
+def _compute_changes(existing_container: Dict,
+                     profile: str,
+                     description: str,
+                     associated_people_dns: List[str]) -> Dict:
+    """
+    Compare the attributes of an existing container with the requested attributes. Only the existing attributes used
+        by the selected profile are read from the container.
+    :param existing_container: The existing container object, as returned by the search function.
+    :param profile: The container profile of the existing container.
+    :param description: The requested description. An empty string indicates that there should be no description.
+    :param associated_people_dns: A list of DNs corresponding to the requested associated people. See apply for how
+        this list is interpreted for each profile.
+    :return: A dict containing the arguments that must be passed to _modify to apply the changes. Only the attributes
+        that differ from the existing container are included, so the dict will be empty if no modify is required.
+    """
+    spec = _container_profiles[profile]
+    changes = {}
 
-        elif profile == "BPOrganization":
-            if associated_people_dns == []:
-                new_sponsor = ''
-            else:
-                new_sponsor = associated_people_dns[0]
-
-            if existing_sponsor is None:
-                if new_sponsor != '':
-                    modify_required = True
-                else:
-                    associated_people_dns = None  # set to None so that no change occurs
-            elif new_sponsor != existing_sponsor[0]:
-                modify_required = True
-            else:
-                associated_people_dns = None  # set to None so that no change occurs
+    if spec.has_description:
+        existing_description = get_soap_attribute(existing_container, 'description')
 
-        elif profile == "AdminDomain":
-            if existing_administrators is None:
+        if existing_description is None:
+            if description != '':
+                changes['description'] = description
+        elif description != existing_description[0]:
+            changes['description'] = description
+
+    if spec.people_attribute is not None:
+        existing_people = get_soap_attribute(existing_container, spec.people_attribute)
+
+        if spec.all_people:
+            if existing_people is None:
                 if associated_people_dns != []:
-                    modify_required = True
-                else:
-                    associated_people_dns = None  # set to None so that no change occurs
-            elif Counter(associated_people_dns) != Counter(existing_administrators):
-                modify_required = True
+                    changes['associated_people_dns'] = associated_people_dns
+            elif _admin_list_changed(associated_people_dns, existing_people):
+                changes['associated_people_dns'] = associated_people_dns
+        else:
+            if associated_people_dns == []:
+                new_person = ''
             else:
-                associated_people_dns = None  # set to None so that no change occurs
+                new_person = associated_people_dns[0]
 
-        else:
-            associated_people_dns = None  # set to None so that no change occurs
+            if existing_people is None:
+                if new_person != '':
+                    changes['associated_people_dns'] = associated_people_dns
+            elif new_person != existing_people[0]:
+                changes['associated_people_dns'] = associated_people_dns
 
-        if modify_required:
-            if check_mode:
-                return create_return_object(changed=True)
-            else:
-                existing_dn = existing_container['itimDN']
-
-                ret_obj = _modify(
-                    isim_application=isim_application,
-                    container_dn=existing_dn,
-                    profile=profile,
-                    description=description,
-                    associated_people_dns=associated_people_dns
-                )
-                return strip_zeep_element_data(ret_obj)
-        else:
-            return create_return_object(changed=False)
+    return changes
+
+
+def _admin_list_changed(new_administrators: List[str], existing_administrators: List[str]) -> bool:
+    """
+    Determine whether the administrators of an admin domain need to be changed. The order of the lists is not
+        significant.
+    :param new_administrators: A list of the DNs of the requested administrators.
+    :param existing_administrators: A list of the DNs of the existing administrators.
+    :return: True if the lists contain different DNs, otherwise False.
+    """
+    if len(new_administrators) != len(existing_administrators):
+        return True
+    return sorted(new_administrators) != sorted(existing_administrators)
 
 
 def _create(isim_application: ISIMApplication,
@@ -317,7 +584,8 @@ def _create(isim_application: ISIMApplication,
             profile: str,
             name: str,
             description: str = "",
-            associated_people_dns: List[str] = []) -> IBMResponse:
+            associated_people_dns: List[str] = [],
+            parent_container_object: Optional[Dict] = None) -> IBMResponse:
     """
     Create a Container. To set an attribute to an empty value, use an empty string or empty list. Do not use None as
     this indicates no change, which is not applicable to a create operation.
@@ -336,37 +604,34 @@ def _create(isim_application: ISIMApplication,
         the other entries will be ignored. For a business partner unit, the first entry in the list will be set as the
         sponsor, and the other entries will be ignored. For an admin domain, each entry in the list will be set as an
         administrator of the admin domain.
+    :param parent_container_object: The parent container object, if it has already been retrieved. If it is not
+        provided, it will be retrieved using parent_container_dn.
     :return: An IBMResponse object. If the call was successful, the data field will contain the Python dict
         representation of the action taken by the server.
     """
+    # Validate the profile before making any calls to the server
+    _validate_profile(profile)
+
     data = []
 
     # Get the required SOAP types
-    container_type_response = isim_application.retrieve_soap_type(soap_service,
-                                                                  "ns1:WSOrganizationalContainer",
-                                                                  requires_version=requires_version)
-    # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
-    if container_type_response['rc'] != 0:
-        return container_type_response
-    container_type = container_type_response['data']
-
-    # Retrieve the attribute type
-    attribute_type_response = isim_application.retrieve_soap_type(soap_service,
-                                                                  "ns1:WSAttribute",
-                                                                  requires_version=requires_version)
+    soap_types_response = _retrieve_soap_types(isim_application)
+
     # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
-    if attribute_type_response['rc'] != 0:
-        return attribute_type_response
-    attr_type = attribute_type_response['data']
+    if soap_types_response['rc'] != 0:
+        return soap_types_response
+    container_type, attr_type = soap_types_response['data']
 
-    # Retrieve the parent container object (the business unit)
-    parent_container_response = isimws.isim.container.get(isim_application=isim_application, container_dn=parent_container_dn)
+    # Retrieve the parent container object (the business unit) if it wasn't provided
+    if parent_container_object is None:
+        parent_container_response = get(isim_application=isim_application, container_dn=parent_container_dn)
 
-    # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
-    if parent_container_response['rc'] != 0:
-        return parent_container_response
+        # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
+        if parent_container_response['rc'] != 0:
+            return parent_container_response
+
+        parent_container_object = parent_container_response['data']
 
-    parent_container_object = parent_container_response['data']
     data.append(parent_container_object)
 
     # Setup the new container object
@@ -377,12 +642,7 @@ def _create(isim_application: ISIMApplication,
 
     # The SOAP API uses different profile names depending on which operation is being performed for some reason. We
     # set the profile name here according to what is expected for a create operation.
-    if profile == "BPOrganization":
-        container_object['profileName'] = "BusinessPartnerOrganization"
-    elif profile == "AdminDomain":
-        container_object['profileName'] = "SecurityDomain"
-    else:
-        container_object['profileName'] = profile
+    container_object['profileName'] = _create_profile_names.get(profile, profile)
 
     # Populate the container attributes
     attribute_list = _build_container_attributes_list(
@@ -402,6 +662,13 @@ def _create(isim_application: ISIMApplication,
                                                    "createContainer",
                                                    data,
                                                    requires_version=requires_version)
+
+    # The cached state of the parent container will be out of date once a child is added to it, and any cached result
+    # of looking for the new container will be too
+    _invalidate_cached_container(isim_application, parent_container_dn)
+    _invalidate_existing_containers(isim_application,
+                                    lambda key, existing_container: key[1] == profile and key[2] == name)
+
     return ret_obj
 
 
@@ -429,23 +696,16 @@ def _modify(isim_application: ISIMApplication,
     :return: An IBMResponse object. If the call was successful, the data field will be empty.
     """
 
+    # Validate the profile before making any calls to the server
+    _validate_profile(profile)
+
     # Get the required SOAP types
-    container_type_response = isim_application.retrieve_soap_type(soap_service,
-                                                                  "ns1:WSOrganizationalContainer",
-                                                                  requires_version=requires_version)
-    # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
-    if container_type_response['rc'] != 0:
-        return container_type_response
-    container_type = container_type_response['data']
-
-    # Retrieve the attribute type
-    attribute_type_response = isim_application.retrieve_soap_type(soap_service,
-                                                                  "ns1:WSAttribute",
-                                                                  requires_version=requires_version)
+    soap_types_response = _retrieve_soap_types(isim_application)
+
     # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
-    if attribute_type_response['rc'] != 0:
-        return attribute_type_response
-    attr_type = attribute_type_response['data']
+    if soap_types_response['rc'] != 0:
+        return soap_types_response
+    container_type, attr_type = soap_types_response['data']
 
     data = []
 
@@ -473,9 +733,47 @@ def _modify(isim_application: ISIMApplication,
                                                    "modifyContainer",
                                                    data,
                                                    requires_version=requires_version)
+
+    # The cached state of this container will be out of date once it is modified
+    _invalidate_cached_container(isim_application, container_dn)
+    _invalidate_existing_containers(
+        isim_application,
+        lambda key, existing_container: (existing_container is not None and
+                                         existing_container['itimDN'].lower() == container_dn.lower())
+    )
+
     return ret_obj
 
 
+def _validate_profile(profile: str):
+    """
+    Check that a container profile is valid, raising a ValueError if it isn't.
+    :param profile: The container profile to check.
+    """
+    if profile not in _container_profiles:
+        raise ValueError("'" + profile + "' is not a valid container profile. Valid values are 'Organization', "
+                                         "'OrganizationalUnit', 'BPOrganization', 'Location', or 'AdminDomain'.")
+
+
+def _retrieve_soap_types(isim_application: ISIMApplication) -> IBMResponse:
+    """
+    Retrieve the SOAP types used by the _create and _modify functions. The ISIMApplication caches the types, so they
+        are only looked up in the service schema once.
+    :param isim_application: The ISIMApplication instance to connect to.
+    :return: An IBMResponse object. If the call was successful, the data field will contain a tuple of the container
+        type and the attribute type.
+    """
+    # Get the container type and the attribute type
+    soap_types_response = isim_application.retrieve_soap_types(soap_service,
+                                                               ["ns1:WSOrganizationalContainer", "ns1:WSAttribute"],
+                                                               requires_version=requires_version)
+    # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
+    if soap_types_response['rc'] != 0:
+        return soap_types_response
+
+    return create_return_object(data=tuple(soap_types_response['data']))
+
+
 def _build_container_attributes_list(
         attr_type,
         profile: str,
@@ -503,45 +801,24 @@ def _build_container_attributes_list(
     :return: A list of attributes formatted to be passed to the SOAP API.
     """
 
+    _validate_profile(profile)
+    spec = _container_profiles[profile]
+
     attribute_list = []
 
     if name is not None:
-        if profile == "Organization":
-            attribute_list.append(build_attribute(attr_type, 'o', [name]))
-        elif profile == "OrganizationalUnit" or profile == "BPOrganization" or profile == "AdminDomain":
-            attribute_list.append(build_attribute(attr_type, 'ou', [name]))
-        elif profile == "Location":
-            attribute_list.append(build_attribute(attr_type, 'l', [name]))
-        else:
-            raise ValueError("'" + profile + "' is not a valid container profile. Valid values are 'Organization', "
-                                             "'OrganizationalUnit', 'BPOrganization', 'Location', or 'AdminDomain'.")
-
-    if description is not None:
-        if profile == "Organization" or \
-                profile == "OrganizationalUnit" or \
-                profile == "Location" or \
-                profile == "AdminDomain":
-            if description == '':
-                attribute_list.append(build_attribute(attr_type, 'description', []))
-            else:
-                attribute_list.append(build_attribute(attr_type, 'description', [description]))
-        elif profile == "BPOrganization":
-            pass
+        attribute_list.append(build_attribute(attr_type, spec.name_attribute, [name]))
+
+    if description is not None and spec.has_description:
+        if description == '':
+            attribute_list.append(build_attribute(attr_type, 'description', []))
         else:
-            raise ValueError("'" + profile + "' is not a valid container profile. Valid values are 'Organization', "
-                                             "'OrganizationalUnit', 'BPOrganization', 'Location', or 'AdminDomain'.")
-
-    if associated_people_dns is not None:
-        if profile == "Organization":
-            pass
-        elif profile == "OrganizationalUnit" or profile == "Location":
-            attribute_list.append(build_attribute(attr_type, 'erSupervisor', [associated_people_dns[0]]))
-        elif profile == "BPOrganization":
-            attribute_list.append(build_attribute(attr_type, 'erSponsor', [associated_people_dns[0]]))
-        elif profile == "AdminDomain":
-            attribute_list.append(build_attribute(attr_type, 'erAdministrator', associated_people_dns))
+            attribute_list.append(build_attribute(attr_type, 'description', [description]))
+
+    if associated_people_dns is not None and spec.people_attribute is not None:
+        if spec.all_people:
+            attribute_list.append(build_attribute(attr_type, spec.people_attribute, associated_people_dns))
         else:
-            raise ValueError("'" + profile + "' is not a valid container profile. Valid values are 'Organization', "
-                                             "'OrganizationalUnit', 'BPOrganization', 'Location', or 'AdminDomain'.")
+            attribute_list.append(build_attribute(attr_type, spec.people_attribute, [associated_people_dns[0]]))
 
     return attribute_list
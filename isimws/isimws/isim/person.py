@@ -1,10 +1,11 @@
 from typing import List, Dict, Optional
 from collections import Counter
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from isimws.application.isimapplication import ISIMApplication, IBMResponse, create_return_object
-from isimws.utilities.tools import build_attribute, get_soap_attribute
+from isimws.utilities.tools import build_attributes, get_soap_attribute, combine_write_responses
 from isimws.utilities.dnencoder import DNEncoder
-import isimws
+from isimws.isim import container
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +15,9 @@ soap_service = "WSPersonService"
 # minimum version required by this module
 requires_version = None
 
+# The number of createPerson requests that create_many sends to the server concurrently
+_create_workers = 8
+
 
 def get(isim_application: ISIMApplication, person_dn: str, check_mode=False, force=False) -> IBMResponse:
     """
@@ -265,25 +269,17 @@ def _create(isim_application: ISIMApplication,
     data = []
 
     # Get the required SOAP types
-    person_type_response = isim_application.retrieve_soap_type(soap_service,
-                                                               "ns1:WSPerson",
+    soap_types_response = isim_application.retrieve_soap_types(soap_service,
+                                                               ["ns1:WSPerson", "ns1:WSAttribute"],
                                                                requires_version=requires_version)
 
     # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
-    if person_type_response['rc'] != 0:
-        return person_type_response
-    person_type = person_type_response['data']
-
-    attribute_type_response = isim_application.retrieve_soap_type(soap_service,
-                                                                  "ns1:WSAttribute",
-                                                                  requires_version=requires_version)
-    # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
-    if attribute_type_response['rc'] != 0:
-        return attribute_type_response
-    attr_type = attribute_type_response['data']
+    if soap_types_response['rc'] != 0:
+        return soap_types_response
+    person_type, attr_type = soap_types_response['data']
 
     # Retrieve the container object (the business unit)
-    container_response = isimws.isim.container.get(isim_application=isim_application, container_dn=container_dn)
+    container_response = container.get(isim_application=isim_application, container_dn=container_dn)
 
     # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
     if container_response['rc'] != 0:
@@ -293,27 +289,17 @@ def _create(isim_application: ISIMApplication,
     data.append(container_object)
 
     # Setup the person object
-    person_object = person_type()
-
-    # Check that the profile is valid
-    if profile.lower() == "person":
-        person_object['profileName'] = "Person"
-    else:
-        raise ValueError(profile + "is not a valid profile. Must be 'Person'.")
-
-    person_object['select'] = False
-
-    attribute_list = _build_person_attributes_list(
+    person_object = _build_person_object(
+        person_type=person_type,
         attr_type=attr_type,
         uid=uid,
-        surname=surname,
+        profile=profile,
         full_name=full_name,
+        surname=surname,
         aliases=aliases,
         password=password,
         role_dns=role_dns
     )
-
-    person_object['attributes'] = {'item': attribute_list}
     data.append(person_object)
 
     # Leave the date object empty
@@ -328,6 +314,146 @@ def _create(isim_application: ISIMApplication,
     return ret_obj
 
 
+def create_many(isim_application: ISIMApplication,
+                container_dn: str,
+                people: List[Dict],
+                skip_container_lookup=False,
+                check_mode=False,
+                force=False) -> IBMResponse:
+    """
+    Create several people in the same container. The SOAP API doesn't provide an operation to create more than one
+        person per request, so a createPerson request is still sent for each person. However, the SOAP types and the
+        container object are only retrieved once, and the requests are sent to the server concurrently.
+    :param isim_application: The ISIMApplication instance to connect to.
+    :param container_dn: The DN of the container (business unit) to create the people under.
+    :param people: A list of dicts representing the people to create. Each entry is expected to contain the following
+        keys:
+            {
+                uid: str # The username or UID for the person.
+                profile: str # The name of the profile to use for the person. Currently only "Person" is supported.
+                full_name: str # The full name of the person.
+                surname: str # The surname of the person.
+                aliases: List[str] # Optional. A list of aliases for the person.
+                password: str # Optional. A password to use as the preferred password for the person.
+                role_dns: List[str] # Optional. A list of DNs corresponding to roles that the person will be part of.
+            }
+    :param skip_container_lookup: Set to True to identify the container by it's DN alone, rather than retrieving it
+        from the server first. The container isn't checked for existence, so each createPerson request will fail if
+        it doesn't exist.
+    :param check_mode: Set to True to enable check mode.
+    :param force: Set to True to force execution regardless of current state.
+    :return: An IBMResponse object. The data field will contain a list of the Python dict representations of the
+        action taken by the server for each person, in the same order as the people argument. If any of the creates
+        failed, the error of the first one is returned, with None in place of it's entry in the list, and the changed
+        field will still be True if any of the other people were created.
+    """
+    if len(people) < 1:
+        return create_return_object(data=[])
+
+    if check_mode:
+        return create_return_object(changed=True)
+
+    # Get the required SOAP types
+    soap_types_response = isim_application.retrieve_soap_types(soap_service,
+                                                               ["ns1:WSPerson", "ns1:WSAttribute"],
+                                                               requires_version=requires_version)
+
+    # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
+    if soap_types_response['rc'] != 0:
+        return soap_types_response
+    person_type, attr_type = soap_types_response['data']
+
+    # Retrieve the container object (the business unit)
+    if skip_container_lookup:
+        container_response = container.get_reference(isim_application=isim_application, container_dn=container_dn)
+    else:
+        container_response = container.get(isim_application=isim_application, container_dn=container_dn)
+
+    # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
+    if container_response['rc'] != 0:
+        return container_response
+    container_object = container_response['data']
+
+    # Build all of the person objects before sending any requests, so that an invalid entry doesn't result in only some
+    # of the people being created.
+    person_objects = [
+        _build_person_object(
+            person_type=person_type,
+            attr_type=attr_type,
+            uid=person['uid'],
+            profile=person['profile'],
+            full_name=person['full_name'],
+            surname=person['surname'],
+            aliases=person.get('aliases', []),
+            password=person.get('password', ""),
+            role_dns=person.get('role_dns', [])
+        )
+        for person in people
+    ]
+
+    def create_person(person_object):
+        # Leave the date object empty
+        return isim_application.invoke_soap_request("Creating a Person",
+                                                    soap_service,
+                                                    "createPerson",
+                                                    [container_object, person_object, None],
+                                                    requires_version=requires_version)
+
+    with ThreadPoolExecutor(max_workers=_create_workers) as executor:
+        responses = list(executor.map(create_person, person_objects))
+
+    # If an error was encountered and ignored, the people that were created are still reported, so that Ansible can
+    # process them along with the error
+    return combine_write_responses(responses)
+
+
+def _build_person_object(person_type,
+                         attr_type,
+                         uid: str,
+                         profile: str,
+                         full_name: str,
+                         surname: str,
+                         aliases: List[str],
+                         password: str,
+                         role_dns: List[str]):
+    """
+    Build a person object to be passed to a createPerson request. Used by the _create and create_many functions.
+    :param person_type: The SOAP type that can be used to instantiate a person object.
+    :param attr_type: The SOAP type that can be used to instantiate an attribute object.
+    :param uid: The username or UID for the person.
+    :param profile: The name of the profile to use for the person. Currently only "Person" is supported.
+    :param full_name: The full name of the person.
+    :param surname: The surname of the person.
+    :param aliases: A list of aliases for the person.
+    :param password: A password to use as the preferred password for the person.
+    :param role_dns: A list of DNs corresponding to roles that the person will be part of.
+    :return: The Python representation of the SOAP object.
+    """
+    person_object = person_type()
+
+    # Check that the profile is valid
+    if profile.lower() == "person":
+        person_object['profileName'] = "Person"
+    else:
+        raise ValueError(profile + "is not a valid profile. Must be 'Person'.")
+
+    person_object['select'] = False
+
+    # A new person has no existing values to clear, so empty optional attributes are left out of the request entirely
+    attribute_list = _build_person_attributes_list(
+        attr_type=attr_type,
+        uid=uid,
+        surname=surname,
+        full_name=full_name,
+        aliases=aliases or None,
+        password=password or None,
+        role_dns=role_dns or None
+    )
+
+    person_object['attributes'] = {'item': attribute_list}
+    return person_object
+
+
 def _modify(isim_application: ISIMApplication,
             person_dn: str,
             full_name: Optional[str] = None,
@@ -406,36 +532,22 @@ def _build_person_attributes_list(
     :return: A list of attributes formatted to be passed to the SOAP API.
     """
 
-    attribute_list = []
-
-    if uid is not None:
-        if uid == '':
-            attribute_list.append(build_attribute(attr_type, 'uid', []))
-        else:
-            attribute_list.append(build_attribute(attr_type, 'uid', [uid]))
-
-    if full_name is not None:
-        if full_name == '':
-            attribute_list.append(build_attribute(attr_type, 'cn', []))
-        else:
-            attribute_list.append(build_attribute(attr_type, 'cn', [full_name]))
+    items = []
 
-    if surname is not None:
-        if surname == '':
-            attribute_list.append(build_attribute(attr_type, 'sn', []))
-        else:
-            attribute_list.append(build_attribute(attr_type, 'sn', [surname]))
+    # Single valued attributes are set to an empty list of values if they are empty strings
+    for key, value in (('uid', uid), ('cn', full_name), ('sn', surname)):
+        if value is not None:
+            items.append((key, [] if value == '' else [value]))
 
     if aliases is not None:
-        attribute_list.append(build_attribute(attr_type, 'eraliases', aliases))
+        items.append(('eraliases', aliases))
 
     if password is not None:
-        if password == '':
-            attribute_list.append(build_attribute(attr_type, 'erpersonpassword', []))
-        else:
-            attribute_list.append(build_attribute(attr_type, 'erpersonpassword', [password]))
+        items.append(('erpersonpassword', [] if password == '' else [password]))
 
     if role_dns is not None:
-        attribute_list.append(build_attribute(attr_type, 'erroles', role_dns))
+        items.append(('erroles', role_dns))
+
+    attribute_list = build_attributes(attr_type, items)
 
     return attribute_list
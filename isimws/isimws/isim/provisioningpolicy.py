@@ -1,9 +1,12 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, NamedTuple
 import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from isimws.application.isimapplication import ISIMApplication, IBMResponse, create_return_object
 from isimws.utilities.dnencoder import DNEncoder
+from isimws.utilities.tools import gather_responses, combine_write_responses
 
-import isimws
+from isimws.isim import container
 
 logger = logging.getLogger(__name__)
 
@@ -13,10 +16,41 @@ soap_service = "WSProvisioningPolicyService"
 # minimum version required by this module
 requires_version = None
 
+# The number of modifyPolicy requests that modify_many sends to the server concurrently
+_modify_workers = 8
+
+# The keys that every entitlement passed to apply must contain
+_required_entitlement_keys = frozenset({'automatic', 'ownership_type', 'target_type', 'workflow'})
+
+# Maps each valid entitlement target_type to the service target type used by the SOAP API, and the entitlement key
+# holding the service target name. A key of None means that the name is '*'.
+# Type 0 is a service type (the name is the name of the service profile. MAKE SURE IT IS EXACT- IT IS CASE_SENSITIVE).
+# Type 1 is a specific service (the name is it's DN).
+# Type 2 is all services (the name is *).
+# Type 3 is a service selection policy (the name is the name of the service profile. MAKE SURE IT IS EXACT- IT IS
+# CASE_SENSITIVE). The service selection policy will be automatically selected based on the service profile selected.
+_service_target_types = {
+    'all': (2, None),
+    'type': (0, 'service_type'),
+    'policy': (3, 'service_type'),
+    'specific': (1, 'service_dn')
+}
+
+# Maps each valid entitlement ownership_type (in lower case) to the ownership type used by the SOAP API
+_ownership_types = {
+    'all': '*',
+    'device': 'Device',
+    'individual': 'Individual',
+    'system': 'System',
+    'vendor': 'Vendor'
+}
+
 
 def search(isim_application: ISIMApplication,
            container_dn: str,
            policy_name: str,
+           skip_container_lookup=False,
+           exact_match=False,
            check_mode=False,
            force=False) -> IBMResponse:
     """
@@ -24,6 +58,10 @@ def search(isim_application: ISIMApplication,
     :param isim_application: The ISIMApplication instance to connect to.
     :param container_dn: The DN of the container to search in.
     :param policy_name: The name of the provisioning policy to search for.
+    :param skip_container_lookup: Set to True to identify the container by it's DN alone, rather than retrieving it
+        from the server first. The container isn't checked for existence.
+    :param exact_match: Set to True to only return policies whose name exactly matches policy_name. The other results
+        are discarded before they are serialized.
     :param check_mode: Set to True to enable check mode
     :param force: Set to True to force execution regardless of current state
     :return: An IBMResponse object. If the call was successful, the data field will contain a lst of the Python dict
@@ -31,7 +69,10 @@ def search(isim_application: ISIMApplication,
     """
     data = []
     # Add the add the container object to the request
-    container_response = isimws.isim.container.get(isim_application=isim_application, container_dn=container_dn)
+    if skip_container_lookup:
+        container_response = container.get_reference(isim_application=isim_application, container_dn=container_dn)
+    else:
+        container_response = container.get(isim_application=isim_application, container_dn=container_dn)
 
     # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
     if container_response['rc'] != 0:
@@ -43,12 +84,18 @@ def search(isim_application: ISIMApplication,
     # Add the policy name to the request
     data.append(str(policy_name))
 
-    # Invoke the call
+    # Invoke the call. For an exact match, the raw Zeep objects are returned so that policies with similar names can be
+    # discarded without serializing them.
     ret_obj = isim_application.invoke_soap_request("Searching for a provisioning policy",
                                                    soap_service,
                                                    "getPolicies",
                                                    data,
-                                                   requires_version=requires_version)
+                                                   requires_version=requires_version,
+                                                   raw=exact_match)
+
+    if exact_match and ret_obj['rc'] == 0:
+        ret_obj.set_unserialized_data([policy for policy in ret_obj['data'] or [] if policy['name'] == policy_name])
+
     return ret_obj
 
 
@@ -64,6 +111,7 @@ def apply(isim_application: ISIMApplication,
           membership_type: Optional[str] = None,
           membership_roles: Optional[List[tuple]] = None,
           entitlements: List[Dict] = [],
+          state_cache: Optional[Dict] = None,
           check_mode=False,
           force=False) -> IBMResponse:
     """
@@ -109,6 +157,10 @@ def apply(isim_application: ISIMApplication,
                     to not use a workflow.
             }
         Note: This API does not currently support adding service tags to entitlements.
+    :param state_cache: An optional dict used to remember the configuration of each policy that was successfully
+        applied. If the same configuration is applied again with the same dict, no calls are made to the server and the
+        policy is assumed to be unchanged. Only use this when the policies aren't modified by anything else in the
+        meantime.
     :param check_mode: Set to True to enable check mode.
     :param force: Set to True to force execution regardless of current state. This will always result in a new policy
         being created, regardless of whether a policy with the same name in the same container already exists. Use with
@@ -118,35 +170,12 @@ def apply(isim_application: ISIMApplication,
     """
 
     # Check that the compulsory attributes are set properly
-    if not (isinstance(container_path, str) and len(container_path) > 0 and
-            isinstance(name, str) and len(name) > 0 and
-            isinstance(priority, int) and priority > 0):
+    if not (isinstance(container_path, str) and len(container_path) > 0):
         raise ValueError("Invalid provisioning policy configuration. organization, container_dn and name must have "
                          "non-empty string values. priority must have an integer value greater than 0.")
 
-    if len(entitlements) < 1:
-        raise ValueError("The entitlements argument must be a list containing at least one entry.")
-
-    # Validate that each entitlement contains the expected keys
-    for entitlement in entitlements:
-        keys = list(entitlement.keys())
-        if 'automatic' not in keys or \
-                'ownership_type' not in keys or \
-                'target_type' not in keys or \
-                'workflow' not in keys:
-            raise ValueError('Missing expected key in entitlement.')
-
-        if entitlement['target_type'] == 'type' or entitlement['target_type'] == 'policy':
-            if 'service_type' not in keys:
-                raise ValueError('Missing expected key in entitlement.')
-        elif entitlement['target_type'] == 'specific':
-            if 'service' not in keys:
-                raise ValueError('Missing expected key in entitlement.')
-
-    if membership_type == 'roles':
-        if membership_roles is None or len(membership_roles) < 1:
-            raise ValueError("The membership_roles argument must contain a list with at least one entry if "
-                             "membership_type is set to 'roles'.")
+    # Validate the rest of the arguments before any calls are made to the server
+    _validate_policy_args(name, priority, membership_type, membership_roles, entitlements)
 
     # Unlike with other object types, None will be interpreted as an empty value rather than as 'no change' by the
     # _create and _modify methods, so we want None values to remain as None. The exception is for boolean values, which
@@ -157,220 +186,126 @@ def apply(isim_application: ISIMApplication,
     if enabled is None:
         enabled = False
 
-    # Convert the container path into a DN that can be passed to the SOAP API. This also validates the container path.
-    dn_encoder = DNEncoder(isim_application)
-    container_dn = dn_encoder.container_path_to_dn(container_path)
+    # Skip the calls to the server entirely if this configuration was already applied successfully
+    state_key = (container_path, name)
+    state = _freeze((priority, description, keywords, caption, available_to_subunits, enabled, membership_type,
+                     membership_roles, entitlements))
+    if state_cache is not None and not force and state_cache.get(state_key) == state:
+        return create_return_object(changed=False)
 
-    # Convert the membership role names into DNs that can be passed to the SOAP API
-    dn_encoder = DNEncoder(isim_application)
-    membership_role_dns = []
-    for membership_role in membership_roles:
-        membership_role_dns.append(dn_encoder.encode_to_isim_dn(container_path=str(membership_role[0]),
-                                                                name=str(membership_role[1]),
-                                                                object_type='role'))
+    ret_obj = _apply_policy(
+        isim_application=isim_application,
+        container_path=container_path,
+        name=name,
+        priority=priority,
+        description=description,
+        keywords=keywords,
+        caption=caption,
+        available_to_subunits=available_to_subunits,
+        enabled=enabled,
+        membership_type=membership_type,
+        membership_roles=membership_roles,
+        entitlements=entitlements,
+        check_mode=check_mode,
+        force=force
+    )
 
-    # Convert the entitlement workflow and service attributes into DNs that can be passed to the SOAP API
-    for entitlement in entitlements:
-        keys = list(entitlement.keys())
+    # A change that was only simulated in check mode hasn't been applied yet
+    if state_cache is not None and ret_obj['rc'] == 0 and not (check_mode and ret_obj['changed']):
+        state_cache[state_key] = state
 
-        if 'workflow' in keys:
-            if entitlement['workflow'] is not None:
-                entitlement['workflow_dn'] = dn_encoder.encode_to_isim_dn(container_path=str(entitlement['workflow'][0]),
-                                                                          name=str(entitlement['workflow'][1]),
-                                                                          object_type='workflow')
-            else:
-                entitlement['workflow_dn'] = None
-            del entitlement['workflow']
-
-        if 'service' in keys:
-            if entitlement['service'] is not None:
-                entitlement['service_dn'] = dn_encoder.encode_to_isim_dn(container_path=str(entitlement['service'][0]),
-                                                                         name=str(entitlement['service'][1]),
-                                                                         object_type='service')
-            else:
-                entitlement['service_dn'] = None
-            del entitlement['service']
+    return ret_obj
+
+
+def _apply_policy(isim_application: ISIMApplication,
+                  container_path: str,
+                  name: str,
+                  priority: int,
+                  description: Optional[str],
+                  keywords: Optional[str],
+                  caption: Optional[str],
+                  available_to_subunits: bool,
+                  enabled: bool,
+                  membership_type: Optional[str],
+                  membership_roles: Optional[List[tuple]],
+                  entitlements: List[Dict],
+                  check_mode=False,
+                  force=False) -> IBMResponse:
+    """
+    Resolve the objects referenced by a provisioning policy configuration, and create or modify the policy as required.
+        Used by apply once the arguments have been validated. See apply for a description of the arguments.
+    :return: An IBMResponse object, as described in apply.
+    """
+    # Convert the container path into a DN that can be passed to the SOAP API. This also validates the container path.
+    dn_encoder = DNEncoder(isim_application)
+    container_dn = dn_encoder.container_path_to_dn(container_path)
 
     # Resolve the instance with the specified name in the specified container
     existing_policy = dn_encoder.get_unique_object(container_path=container_path,
                                                    name=name,
                                                    object_type='provisioningpolicy')
 
-    if existing_policy is None or force:
-        # If the instance doesn't exist yet, create a new role and return the response
-        if check_mode:
-            return create_return_object(changed=True)
-        else:
-            return _create(
-                isim_application=isim_application,
-                container_dn=container_dn,
-                name=name,
-                priority=priority,
-                description=description,
-                keywords=keywords,
-                caption=caption,
-                available_to_subunits=available_to_subunits,
-                enabled=enabled,
-                membership_type=membership_type,
-                membership_role_dns=membership_role_dns,
-                entitlements=entitlements
-            )
-    else:
-        # If an existing instance was found, compare it's attributes with the requested attributes and determine if a
-        # modify operation is required.
-        modify_required = False
-
-        existing_priority = existing_policy['priority']
-        if existing_priority is None or priority != existing_priority:
-            modify_required = True
-
-        existing_description = existing_policy['description']
-        if description != existing_description:
-            modify_required = True
+    # In check mode, a policy that would be created doesn't need any of the objects it references to be resolved
+    if (existing_policy is None or force) and check_mode:
+        return create_return_object(changed=True)
 
-        existing_keywords = existing_policy['keywords']
-        if keywords != existing_keywords:
-            modify_required = True
+    # Convert the membership role names and the entitlement workflow and service attributes into DNs that can be
+    # passed to the SOAP API. All of the objects are collected first so that they can be resolved together.
+    entries = [(str(membership_role[0]), str(membership_role[1]), 'role') for membership_role in membership_roles or []]
+    for entitlement in entitlements:
+        for object_type in ('workflow', 'service'):
+            if entitlement.get(object_type) is not None:
+                entries.append((str(entitlement[object_type][0]), str(entitlement[object_type][1]), object_type))
 
-        existing_caption = existing_policy['caption']
-        if caption != existing_caption:
-            modify_required = True
+    # The DNs are returned in the same order as the entries, so they are assigned back in that order
+    resolved_dns = iter(dn_encoder.encode_batch_to_isim_dns(entries))
+    membership_role_dns = [next(resolved_dns) for membership_role in membership_roles or []]
 
-        # Scope should be set to 1 for 'this business unit only' and 2 for 'this business unit and its subunits'
-        existing_scope = existing_policy['scope']
-        if available_to_subunits and existing_scope != 2:
-            modify_required = True
-        elif not available_to_subunits and existing_scope != 1:
-            modify_required = True
-
-        existing_enabled = existing_policy['enabled']
-        if enabled != existing_enabled:
-            modify_required = True
-
-        existing_memberships = existing_policy['membership']['item']
-        if membership_type == 'all':
-            if len(existing_memberships) != 1:
-                modify_required = True
-
-            if existing_memberships[0]['name'] != '*':
-                modify_required = True
-
-            if existing_memberships[0]['type'] != 2:
-                modify_required = True
-        elif membership_type == 'other':
-            if len(existing_memberships) != 1:
-                modify_required = True
-
-            if existing_memberships[0]['name'] != '*':
-                modify_required = True
-
-            if existing_memberships[0]['type'] != 4:
-                modify_required = True
-        elif membership_type == 'roles':
-            if len(existing_memberships) != len(membership_role_dns):
-                modify_required = True
-
-            # Check each role DN in the target membership list to make sure it has a match in the existing memberships
-            for role_dn in membership_role_dns:
-                match_found = False
-                for membership in existing_memberships:
-                    if membership['name'] == role_dn:
-                        match_found = True
-                        break
-
-                    if membership['type'] != 3:
-                        modify_required = True
-                        break
-                if not match_found:
-                    modify_required = True
-
-                if modify_required:
-                    break
-        else:
-            raise ValueError("Invalid value for membership_type. Valid values are 'all', 'other', or 'roles'.")
-
-        existing_entitlements = existing_policy['entitlements']['item']
-        if len(entitlements) != len(existing_entitlements):
-            modify_required = True
-
-        # Check each entitlement in the target entitlements list to make sure it has a match in the existing
-        # entitlements.
-        for entitlement in entitlements:
-            match_found = False
-            for existing_entitlement in existing_entitlements:
-                match_found = False
-                automatic_match = False
-                ownership_match = False
-                service_target_match = False
-                workflow_match = False
-
-                # Set type 0 for a service type (specify the name of the service profile in the name. MAKE SURE IT IS EXACT-
-                # IT IS CASE_SENSITIVE).
-                # Set type 1 for a specific service (specify it's DN in the name).
-                # Set type 2 for all services (specify * as the name).
-                # Set type 3 for a service selection policy (specify the name of the service profile in the name. MAKE SURE IT
-                # IS EXACT- IT IS CASE_SENSITIVE). The service selection policy will be automatically selected based on the
-                # service profile selected.
-
-                if entitlement['target_type'] == 'all':
-                    if existing_entitlement['serviceTarget']['name'] == '*' and \
-                            existing_entitlement['serviceTarget']['type'] == 2:
-                        service_target_match = True
-                elif entitlement['target_type'] == 'type':
-                    if existing_entitlement['serviceTarget']['name'] == entitlement['service_type'] and \
-                            existing_entitlement['serviceTarget']['type'] == 0:
-                        service_target_match = True
-                elif entitlement['target_type'] == 'policy':
-                    if existing_entitlement['serviceTarget']['name'] == entitlement['service_type'] and \
-                            existing_entitlement['serviceTarget']['type'] == 3:
-                        service_target_match = True
-                elif entitlement['target_type'] == 'specific':
-                    if existing_entitlement['serviceTarget']['name'] == entitlement['service_dn'] and \
-                            existing_entitlement['serviceTarget']['type'] == 1:
-                        service_target_match = True
-                else:
-                    raise ValueError(
-                        "Invalid target_type value in entitlement. Valid values are 'all', 'type', 'policy', "
-                        "or 'specific'.")
-
-                # The type value should be set to 0 for manual provisioning, or 1 for automatic provisioning
-                if entitlement['automatic']:
-                    if existing_entitlement['type'] == 1:
-                        automatic_match = True
-                else:
-                    if existing_entitlement['type'] == 0:
-                        automatic_match = True
-
-                if existing_entitlement['processDN'] == entitlement['workflow_dn']:
-                    workflow_match = True
-
-                if entitlement['ownership_type'].lower() == 'all':
-                    if existing_entitlement['ownershipType'] == '*':
-                        ownership_match = True
-                elif entitlement['ownership_type'].lower() == 'device':
-                    if existing_entitlement['ownershipType'] == 'Device':
-                        ownership_match = True
-                elif entitlement['ownership_type'].lower() == 'individual':
-                    if existing_entitlement['ownershipType'] == 'Individual':
-                        ownership_match = True
-                elif entitlement['ownership_type'].lower() == 'system':
-                    if existing_entitlement['ownershipType'] == 'System':
-                        ownership_match = True
-                elif entitlement['ownership_type'].lower() == 'vendor':
-                    if existing_entitlement['ownershipType'] == 'Vendor':
-                        ownership_match = True
+    # New entitlement dicts are built rather than modifying the ones passed in, so that the caller can reuse them
+    resolved_entitlements = []
+    for entitlement in entitlements:
+        resolved_entitlement = {key: value for key, value in entitlement.items()
+                                if key != 'workflow' and key != 'service'}
+        for object_type in ('workflow', 'service'):
+            if object_type in entitlement:
+                if entitlement[object_type] is not None:
+                    resolved_entitlement[object_type + '_dn'] = next(resolved_dns)
                 else:
-                    raise ValueError(
-                        "Invalid value for entitlement ownership_type. Valid values are 'all', 'device', "
-                        "'individual', 'system', or 'vendor'.")
-
-                if automatic_match and ownership_match and service_target_match and workflow_match:
-                    match_found = True
-                    break
+                    resolved_entitlement[object_type + '_dn'] = None
+        resolved_entitlements.append(resolved_entitlement)
+    entitlements = resolved_entitlements
 
-            if not match_found:
-                modify_required = True
-                break
+    if existing_policy is None or force:
+        # If the instance doesn't exist yet, create a new policy and return the response
+        return _create(
+            isim_application=isim_application,
+            container_dn=container_dn,
+            name=name,
+            priority=priority,
+            description=description,
+            keywords=keywords,
+            caption=caption,
+            available_to_subunits=available_to_subunits,
+            enabled=enabled,
+            membership_type=membership_type,
+            membership_role_dns=membership_role_dns,
+            entitlements=entitlements
+        )
+    else:
+        # If an existing instance was found, compare it's attributes with the requested attributes and determine if a
+        # modify operation is required.
+        modify_required = _needs_modify(
+            existing_policy=existing_policy,
+            priority=priority,
+            description=description,
+            keywords=keywords,
+            caption=caption,
+            available_to_subunits=available_to_subunits,
+            enabled=enabled,
+            membership_type=membership_type,
+            membership_role_dns=membership_role_dns,
+            entitlements=entitlements
+        )
 
         if modify_required:
             if check_mode:
@@ -397,6 +332,102 @@ def apply(isim_application: ISIMApplication,
             return create_return_object(changed=False)
 
 
+def _freeze(value):
+    """
+    Convert a value made up of dicts, lists and tuples into an equivalent hashable value, so that it can be compared
+        with a value stored in a state cache.
+    :param value: The value to convert.
+    :return: The converted value.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _needs_modify(existing_policy: Dict,
+                  priority: int,
+                  description: Optional[str],
+                  keywords: Optional[str],
+                  caption: Optional[str],
+                  available_to_subunits: bool,
+                  enabled: bool,
+                  membership_type: Optional[str],
+                  membership_role_dns: List[str],
+                  entitlements: List[Dict]) -> bool:
+    """
+    Compare an existing provisioning policy with the requested attributes. The cheapest comparisons are made first, and
+        the comparison stops at the first difference found.
+    :param existing_policy: The existing policy, as returned by the SOAP API.
+    :param priority: The requested priority.
+    :param description: The requested description.
+    :param keywords: The requested keywords.
+    :param caption: The requested caption.
+    :param available_to_subunits: The requested availability to subunits.
+    :param enabled: The requested enabled state.
+    :param membership_type: The requested membership type, as described in apply.
+    :param membership_role_dns: The DNs of the requested membership roles.
+    :param entitlements: The requested entitlements, with their workflows and services converted into DNs.
+    :return: True if a modify operation is required, or False if the policy already matches.
+    """
+    existing_priority = existing_policy['priority']
+    if existing_priority is None or priority != existing_priority:
+        return True
+
+    # Scope should be set to 1 for 'this business unit only' and 2 for 'this business unit and its subunits'
+    if existing_policy['scope'] != (2 if available_to_subunits else 1):
+        return True
+
+    if enabled != existing_policy['enabled']:
+        return True
+
+    if description != existing_policy['description'] or \
+            keywords != existing_policy['keywords'] or \
+            caption != existing_policy['caption']:
+        return True
+
+    existing_entitlements = existing_policy['entitlements']['item']
+    if len(entitlements) != len(existing_entitlements):
+        return True
+
+    existing_memberships = existing_policy['membership']['item'] or []
+    if membership_type is None:
+        # No memberships are set by _create and _modify when the membership type is None
+        if len(existing_memberships) != 0:
+            return True
+    elif membership_type == 'all' or membership_type == 'other':
+        if len(existing_memberships) != 1:
+            return True
+
+        if existing_memberships[0]['name'] != '*':
+            return True
+
+        if existing_memberships[0]['type'] != (2 if membership_type == 'all' else 4):
+            return True
+    elif membership_type == 'roles':
+        if len(existing_memberships) != len(membership_role_dns):
+            return True
+
+        # Every existing membership must be a role membership (type 3) for one of the target role DNs
+        existing_role_dns = {membership['name'] for membership in existing_memberships if membership['type'] == 3}
+        if existing_role_dns != set(membership_role_dns):
+            return True
+    else:
+        raise ValueError("Invalid value for membership_type. Valid values are 'all', 'other', or 'roles'.")
+
+    # Check each entitlement in the target entitlements list to make sure it has a match in the existing
+    # entitlements. The existing entitlements are indexed by the values that are compared, so each target entitlement
+    # is matched with a single lookup.
+    existing_fingerprints = {_existing_entitlement_fingerprint(existing_entitlement)
+                             for existing_entitlement in existing_entitlements}
+    for entitlement in entitlements:
+        if _entitlement_fingerprint(entitlement) not in existing_fingerprints:
+            return True
+
+    return False
+
+
 def _create(isim_application: ISIMApplication,
             container_dn: str,
             name: str,
@@ -451,50 +482,21 @@ def _create(isim_application: ISIMApplication,
     """
     data = []
 
-    # Get the required SOAP types
-
-    # Get the policy type
-    policy_type_response = isim_application.retrieve_soap_type(soap_service,
-                                                               "ns1:WSProvisioningPolicy",
-                                                               requires_version=requires_version)
-
-    # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
-    if policy_type_response['rc'] != 0:
-        return policy_type_response
-    policy_type = policy_type_response['data']
-
-    # Get the policy membership type
-    policy_membership_type_response = isim_application.retrieve_soap_type(soap_service,
-                                                                          "ns1:WSProvisioningPolicyMembership",
-                                                                          requires_version=requires_version)
+    # Normalize the entitlements and memberships before any calls are made to the server, so that invalid values are
+    # detected first
+    normalized_entitlements = [_normalize_entitlement(entitlement) for entitlement in entitlements]
+    normalized_memberships = _normalize_memberships(membership_type, membership_role_dns)
 
-    # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
-    if policy_membership_type_response['rc'] != 0:
-        return policy_membership_type_response
-    policy_membership_type = policy_membership_type_response['data']
-
-    # Get the policy entitlement type
-    policy_entitlement_type_response = isim_application.retrieve_soap_type(soap_service,
-                                                                           "ns1:WSProvisioningPolicyEntitlement",
-                                                                           requires_version=requires_version)
-
-    # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
-    if policy_entitlement_type_response['rc'] != 0:
-        return policy_entitlement_type_response
-    policy_entitlement_type = policy_entitlement_type_response['data']
-
-    # Get the service target type
-    service_target_type_response = isim_application.retrieve_soap_type(soap_service,
-                                                                       "ns1:WSServiceTarget",
-                                                                       requires_version=requires_version)
+    # Get the required SOAP types
+    soap_types_response = _retrieve_soap_types(isim_application)
 
     # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
-    if service_target_type_response['rc'] != 0:
-        return service_target_type_response
-    service_target_type = service_target_type_response['data']
+    if soap_types_response['rc'] != 0:
+        return soap_types_response
+    policy_type, policy_membership_type, policy_entitlement_type, service_target_type = soap_types_response['data']
 
     # Retrieve the container object (the business unit)
-    container_response = isimws.isim.container.get(isim_application=isim_application, container_dn=container_dn)
+    container_response = container.get(isim_application=isim_application, container_dn=container_dn)
 
     # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
     if container_response['rc'] != 0:
@@ -503,7 +505,8 @@ def _create(isim_application: ISIMApplication,
     container_object = container_response['data']
     data.append(container_object)
 
-    # Setup the policy object
+    # Setup the policy object. A new policy has no existing values to clear, so empty strings are left out of the
+    # request entirely.
     policy_object = _setup_policy_object(
         policy_type=policy_type,
         policy_entitlement_type=policy_entitlement_type,
@@ -512,14 +515,13 @@ def _create(isim_application: ISIMApplication,
         container_object=container_object,
         name=name,
         priority=priority,
-        description=description,
-        keywords=keywords,
-        caption=caption,
+        description=description or None,
+        keywords=keywords or None,
+        caption=caption or None,
         available_to_subunits=available_to_subunits,
         enabled=enabled,
-        membership_type=membership_type,
-        membership_role_dns=membership_role_dns,
-        entitlements=entitlements
+        memberships=normalized_memberships,
+        entitlements=normalized_entitlements
     )
 
     data.append(policy_object)
@@ -593,50 +595,21 @@ def _modify(isim_application: ISIMApplication,
     """
     data = []
 
-    # Get the required SOAP types
-
-    # Get the policy type
-    policy_type_response = isim_application.retrieve_soap_type(soap_service,
-                                                               "ns1:WSProvisioningPolicy",
-                                                               requires_version=requires_version)
-
-    # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
-    if policy_type_response['rc'] != 0:
-        return policy_type_response
-    policy_type = policy_type_response['data']
-
-    # Get the policy membership type
-    policy_membership_type_response = isim_application.retrieve_soap_type(soap_service,
-                                                                          "ns1:WSProvisioningPolicyMembership",
-                                                                          requires_version=requires_version)
-
-    # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
-    if policy_membership_type_response['rc'] != 0:
-        return policy_membership_type_response
-    policy_membership_type = policy_membership_type_response['data']
-
-    # Get the policy entitlement type
-    policy_entitlement_type_response = isim_application.retrieve_soap_type(soap_service,
-                                                                           "ns1:WSProvisioningPolicyEntitlement",
-                                                                           requires_version=requires_version)
-
-    # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
-    if policy_entitlement_type_response['rc'] != 0:
-        return policy_entitlement_type_response
-    policy_entitlement_type = policy_entitlement_type_response['data']
+    # Normalize the entitlements and memberships before any calls are made to the server, so that invalid values are
+    # detected first
+    normalized_entitlements = [_normalize_entitlement(entitlement) for entitlement in entitlements]
+    normalized_memberships = _normalize_memberships(membership_type, membership_role_dns)
 
-    # Get the service target type
-    service_target_type_response = isim_application.retrieve_soap_type(soap_service,
-                                                                       "ns1:WSServiceTarget",
-                                                                       requires_version=requires_version)
+    # Get the required SOAP types
+    soap_types_response = _retrieve_soap_types(isim_application)
 
     # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
-    if service_target_type_response['rc'] != 0:
-        return service_target_type_response
-    service_target_type = service_target_type_response['data']
+    if soap_types_response['rc'] != 0:
+        return soap_types_response
+    policy_type, policy_membership_type, policy_entitlement_type, service_target_type = soap_types_response['data']
 
     # Retrieve the container object (the business unit)
-    container_response = isimws.isim.container.get(isim_application=isim_application, container_dn=container_dn)
+    container_response = container.get(isim_application=isim_application, container_dn=container_dn)
 
     # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
     if container_response['rc'] != 0:
@@ -659,9 +632,8 @@ def _modify(isim_application: ISIMApplication,
         caption=caption,
         available_to_subunits=available_to_subunits,
         enabled=enabled,
-        membership_type=membership_type,
-        membership_role_dns=membership_role_dns,
-        entitlements=entitlements
+        memberships=normalized_memberships,
+        entitlements=normalized_entitlements
     )
 
     policy_object['itimDN'] = policy_dn  # Add the policy DN so that the existing policy can be identified
@@ -680,6 +652,346 @@ def _modify(isim_application: ISIMApplication,
     return ret_obj
 
 
+def modify_many(isim_application: ISIMApplication,
+                policies: List[Dict],
+                skip_unchanged=False,
+                check_mode=False,
+                force=False) -> IBMResponse:
+    """
+    Modify several existing provisioning policies. The SOAP API doesn't provide an operation to modify more than one
+        policy per request, so a modifyPolicy request is still sent for each policy. However, the SOAP types and each
+        distinct container object are only retrieved once, and the requests are sent to the server concurrently. All
+        attributes of each policy will be set, as described in _modify.
+    :param isim_application: The ISIMApplication instance to connect to.
+    :param policies: A list of dicts representing the policies to modify. Each entry is expected to contain the
+        following keys, in the same format as the arguments of the same names in _modify:
+            {
+                policy_dn: str # The DN of the existing policy to modify.
+                container_dn: str # The DN of the container (business unit) that the policy exists in.
+                name: str # The name of the policy.
+                priority: int # An integer greater than 0 representing the priority of the policy.
+                description: str # Optional.
+                keywords: str # Optional.
+                caption: str # Optional.
+                available_to_subunits: bool # Optional.
+                enabled: bool # Optional.
+                membership_type: str # Optional.
+                membership_role_dns: List[str] # Optional.
+                entitlements: List[Dict] # The entitlements for the policy, with workflow_dn and service_dn keys.
+            }
+    :param skip_unchanged: Set to True to retrieve each existing policy first, and only send a modifyPolicy request for
+        the policies that don't already match the requested attributes.
+    :param check_mode: Set to True to enable check mode.
+    :param force: Set to True to force execution regardless of current state.
+    :return: An IBMResponse object. The data field will contain a list of the data returned by the server for each
+        policy, in the same order as the policies argument. The entry for each policy that was skipped because it was
+        unchanged will be None. If any of the modifies failed, the error of the first one is returned, with None in
+        place of it's entry in the list, and the changed field will still be True if any of the other policies were
+        modified.
+    """
+    if len(policies) < 1:
+        return create_return_object(data=[])
+
+    # Normalize every policy before any calls are made to the server, so that an invalid entry doesn't result in only
+    # some of the policies being modified
+    normalized_policies = [
+        (policy,
+         [_normalize_entitlement(entitlement) for entitlement in policy['entitlements']],
+         _normalize_memberships(policy.get('membership_type'), policy.get('membership_role_dns')))
+        for policy in policies
+    ]
+
+    # Find the policies that already match the requested attributes
+    unchanged = [False] * len(policies)
+    if skip_unchanged:
+        existing_response = gather_responses([functools.partial(search,
+                                                                isim_application=isim_application,
+                                                                container_dn=policy['container_dn'],
+                                                                policy_name=policy['name'],
+                                                                exact_match=True)
+                                              for policy in policies])
+
+        # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
+        if existing_response['rc'] != 0:
+            return existing_response
+
+        for index, (policy, search_results) in enumerate(zip(policies, existing_response['data'])):
+            existing_policy = next((result for result in search_results
+                                    if result['itimDN'].lower() == policy['policy_dn'].lower()), None)
+            if existing_policy is not None:
+                unchanged[index] = not _needs_modify(
+                    existing_policy=existing_policy,
+                    priority=policy['priority'],
+                    description=policy.get('description'),
+                    keywords=policy.get('keywords'),
+                    caption=policy.get('caption'),
+                    available_to_subunits=bool(policy.get('available_to_subunits')),
+                    enabled=bool(policy.get('enabled')),
+                    membership_type=policy.get('membership_type'),
+                    membership_role_dns=policy.get('membership_role_dns') or [],
+                    entitlements=policy['entitlements']
+                )
+
+        if all(unchanged):
+            return create_return_object(data=[None] * len(policies))
+
+    if check_mode:
+        return create_return_object(changed=True)
+
+    # Get the required SOAP types
+    soap_types_response = _retrieve_soap_types(isim_application)
+
+    # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
+    if soap_types_response['rc'] != 0:
+        return soap_types_response
+    policy_type, policy_membership_type, policy_entitlement_type, service_target_type = soap_types_response['data']
+
+    # Only the policies that differ from their existing attributes are modified
+    modified_policies = [normalized_policy
+                         for normalized_policy, is_unchanged in zip(normalized_policies, unchanged) if not is_unchanged]
+
+    # Retrieve each distinct container object (business unit) once
+    container_dns = list(dict.fromkeys(normalized_policy[0]['container_dn'] for normalized_policy in modified_policies))
+    containers_response = container.get_many(isim_application=isim_application, container_dns=container_dns)
+
+    # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
+    if containers_response['rc'] != 0:
+        return containers_response
+    container_objects = dict(zip(container_dns, containers_response['data']))
+
+    policy_objects = []
+    for policy, normalized_entitlements, normalized_memberships in modified_policies:
+        policy_object = _setup_policy_object(
+            policy_type=policy_type,
+            policy_entitlement_type=policy_entitlement_type,
+            service_target_type=service_target_type,
+            policy_membership_type=policy_membership_type,
+            container_object=container_objects[policy['container_dn']],
+            name=policy['name'],
+            priority=policy['priority'],
+            description=policy.get('description'),
+            keywords=policy.get('keywords'),
+            caption=policy.get('caption'),
+            available_to_subunits=policy.get('available_to_subunits'),
+            enabled=policy.get('enabled'),
+            memberships=normalized_memberships,
+            entitlements=normalized_entitlements
+        )
+        policy_object['itimDN'] = policy['policy_dn']  # Add the policy DN so that the existing policy can be identified
+        policy_objects.append((container_objects[policy['container_dn']], policy_object))
+
+    def modify_policy(request_objects):
+        container_object, policy_object = request_objects
+        # Leave the date object empty
+        return isim_application.invoke_soap_request("Modifying a provisioning policy",
+                                                    soap_service,
+                                                    "modifyPolicy",
+                                                    [container_object, policy_object, None],
+                                                    requires_version=requires_version)
+
+    with ThreadPoolExecutor(max_workers=_modify_workers) as executor:
+        responses = list(executor.map(modify_policy, policy_objects))
+
+    # If an error was encountered and ignored, the policies that were modified are still reported, so that Ansible can
+    # process them along with the error
+    ret_obj = combine_write_responses(responses)
+
+    # Fill in the entries for the policies that were skipped
+    modified_data = iter(ret_obj['data'])
+    ret_obj['data'] = [None if is_unchanged else next(modified_data) for is_unchanged in unchanged]
+    return ret_obj
+
+
+def _validate_policy_args(name: str,
+                          priority: int,
+                          membership_type: Optional[str],
+                          membership_roles: Optional[List[tuple]],
+                          entitlements: List[Dict]):
+    """
+    Validate the arguments passed to apply, without making any calls to the server.
+    :param name: The provisioning policy name.
+    :param priority: The priority of the policy.
+    :param membership_type: The membership type, as described in apply.
+    :param membership_roles: The membership roles, as described in apply.
+    :param entitlements: The entitlements, as described in apply.
+    """
+    if not (isinstance(name, str) and len(name) > 0 and
+            isinstance(priority, int) and priority > 0):
+        raise ValueError("Invalid provisioning policy configuration. organization, container_dn and name must have "
+                         "non-empty string values. priority must have an integer value greater than 0.")
+
+    if len(entitlements) < 1:
+        raise ValueError("The entitlements argument must be a list containing at least one entry.")
+
+    # Validate that each entitlement contains the expected keys and values
+    for entitlement in entitlements:
+        if not _required_entitlement_keys.issubset(entitlement.keys()):
+            raise ValueError('Missing expected key in entitlement.')
+
+        if entitlement['target_type'] == 'type' or entitlement['target_type'] == 'policy':
+            if 'service_type' not in entitlement:
+                raise ValueError('Missing expected key in entitlement.')
+        elif entitlement['target_type'] == 'specific':
+            if 'service' not in entitlement:
+                raise ValueError('Missing expected key in entitlement.')
+        elif entitlement['target_type'] is not None and entitlement['target_type'] not in _service_target_types:
+            raise ValueError("Invalid target_type value in entitlement. Valid values are 'all', 'type', 'policy', "
+                             "or 'specific'.")
+
+        if entitlement['ownership_type'] is not None:
+            _get_ownership_type(entitlement)
+
+    if membership_type == 'roles':
+        if membership_roles is None or len(membership_roles) < 1:
+            raise ValueError("The membership_roles argument must contain a list with at least one entry if "
+                             "membership_type is set to 'roles'.")
+    elif membership_type not in (None, 'all', 'other'):
+        raise ValueError("Invalid value for membership_type. Valid values are 'all', 'other', or 'roles'.")
+
+
+def _get_service_target(entitlement: Dict) -> Tuple[int, str]:
+    """
+    Determine the service target of an entitlement.
+    :param entitlement: A dict representing an entitlement, as described in _create.
+    :return: A tuple containing the service target type and the service target name used by the SOAP API.
+    """
+    service_target = _service_target_types.get(entitlement['target_type'])
+    if service_target is None:
+        raise ValueError("Invalid target_type value in entitlement. Valid values are 'all', 'type', 'policy', "
+                         "or 'specific'.")
+
+    service_target_type, name_key = service_target
+    if name_key is None:
+        return service_target_type, '*'
+    return service_target_type, entitlement[name_key]
+
+
+def _get_ownership_type(entitlement: Dict) -> str:
+    """
+    Determine the ownership type of an entitlement.
+    :param entitlement: A dict representing an entitlement, as described in _create.
+    :return: The ownership type used by the SOAP API.
+    """
+    ownership_type = _ownership_types.get(entitlement['ownership_type'].lower())
+    if ownership_type is None:
+        raise ValueError("Invalid value for entitlement ownership_type. Valid values are 'all', 'device', "
+                         "'individual', 'system', or 'vendor'.")
+    return ownership_type
+
+
+def _entitlement_fingerprint(entitlement: Dict) -> Tuple:
+    """
+    Get the values of a target entitlement that are compared with the existing entitlements by apply.
+    :param entitlement: A dict representing an entitlement, as described in _create.
+    :return: A tuple containing the service target name, service target type, provisioning type, workflow DN, and
+        ownership type of the entitlement.
+    """
+    service_target_type, service_target_name = _get_service_target(entitlement)
+
+    # The type value should be set to 0 for manual provisioning, or 1 for automatic provisioning
+    provisioning_type = 1 if entitlement['automatic'] else 0
+
+    return (service_target_name, service_target_type, provisioning_type, entitlement['workflow_dn'],
+            _get_ownership_type(entitlement))
+
+
+def _existing_entitlement_fingerprint(existing_entitlement: Dict) -> Tuple:
+    """
+    Get the values of an existing entitlement that are compared with the target entitlements by apply.
+    :param existing_entitlement: An entitlement as returned by the SOAP API.
+    :return: A tuple in the same format as the one returned by _entitlement_fingerprint.
+    """
+    return (existing_entitlement['serviceTarget']['name'], existing_entitlement['serviceTarget']['type'],
+            existing_entitlement['type'], existing_entitlement['processDN'], existing_entitlement['ownershipType'])
+
+
+class _NormalizedEntitlement(NamedTuple):
+    """
+    The values of an entitlement, as they will be set in the SOAP entitlement object. A value of None leaves the
+    corresponding field unset.
+    """
+    service_target_name: Optional[str]
+    service_target_type: Optional[str]
+    type: Optional[int]  # 0 for manual provisioning, or 1 for automatic provisioning
+    process_dn: Optional[str]
+    ownership_type: Optional[str]
+
+
+def _normalize_entitlement(entitlement: Dict) -> _NormalizedEntitlement:
+    """
+    Convert an entitlement into the values used by the SOAP API.
+    :param entitlement: A dict representing an entitlement, as described in _create.
+    :return: The normalized entitlement.
+    """
+    service_target_name = None
+    service_target_type = None
+    if entitlement['target_type'] is not None:
+        target_type, service_target_name = _get_service_target(entitlement)
+        service_target_type = str(target_type)
+
+    provisioning_type = None
+    if entitlement['automatic'] is not None:
+        provisioning_type = 1 if entitlement['automatic'] else 0
+
+    process_dn = None
+    if entitlement['workflow_dn'] is not None:
+        process_dn = str(entitlement['workflow_dn'])
+
+    ownership_type = None
+    if entitlement['ownership_type'] is not None:
+        ownership_type = _get_ownership_type(entitlement)
+
+    return _NormalizedEntitlement(service_target_name, service_target_type, provisioning_type, process_dn,
+                                  ownership_type)
+
+
+def _normalize_memberships(membership_type: Optional[str],
+                           membership_role_dns: Optional[List[str]]) -> List[Tuple[str, str]]:
+    """
+    Convert the membership arguments of a policy into the values used by the SOAP API.
+    :param membership_type: The membership type, as described in _create.
+    :param membership_role_dns: The membership role DNs, as described in _create.
+    :return: A list of tuples containing the name and type of each membership object.
+    """
+    if membership_type is None:
+        return []
+
+    # Set type 2 for all users in the organization. Specify '*' as the name.
+    # Set type 3 to specify a specific role. Specify the role DN as the name. Create more membership objects for
+    # more roles.
+    # Set type 4 for all other users who are not granted to the entitlement(s) defined by this provisioning policy
+    # via other policies. Specify '*' as the name.
+    if membership_type == 'all':
+        return [('*', '2')]
+    elif membership_type == 'other':
+        return [('*', '4')]
+    elif membership_type == 'roles':
+        return [(str(role), '3') for role in membership_role_dns]
+    else:
+        raise ValueError("Invalid value for membership_type. Valid values are 'all', 'other', or 'roles'.")
+
+
+def _retrieve_soap_types(isim_application: ISIMApplication) -> IBMResponse:
+    """
+    Retrieve the SOAP types used by the _create and _modify functions. The ISIMApplication caches the types, so they
+        are only looked up in the service schema once.
+    :param isim_application: The ISIMApplication instance to connect to.
+    :return: An IBMResponse object. If the call was successful, the data field will contain a tuple of the policy type,
+        the policy membership type, the policy entitlement type, and the service target type.
+    """
+    soap_types_response = isim_application.retrieve_soap_types(soap_service,
+                                                               ["ns1:WSProvisioningPolicy",
+                                                                "ns1:WSProvisioningPolicyMembership",
+                                                                "ns1:WSProvisioningPolicyEntitlement",
+                                                                "ns1:WSServiceTarget"],
+                                                               requires_version=requires_version)
+    # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
+    if soap_types_response['rc'] != 0:
+        return soap_types_response
+
+    return create_return_object(data=tuple(soap_types_response['data']))
+
+
 def _setup_policy_object(policy_type,
                          policy_entitlement_type,
                          service_target_type,
@@ -692,9 +1004,8 @@ def _setup_policy_object(policy_type,
                          caption: Optional[str] = None,
                          available_to_subunits: Optional[bool] = None,
                          enabled: Optional[bool] = None,
-                         membership_type: Optional[str] = None,
-                         membership_role_dns: Optional[List[str]] = None,
-                         entitlements: List[Dict] = []):
+                         memberships: List[Tuple[str, str]] = [],
+                         entitlements: List[_NormalizedEntitlement] = []):
     """
     Setup the policy object used in the create and modify SOAP requests.
     :param policy_type: The SOAP type that can be used to instantiate a policy object.
@@ -710,28 +1021,9 @@ def _setup_policy_object(policy_type,
     :param available_to_subunits: Set to True to make the policy available to services in subunits of the selected
         business unit, or False to make it available to this business unit only.
     :param enabled: Set to True to enable the policy, or False to disable it.
-    :param membership_type: A string value determining how membership of the policy will be determined. Valid values
-        are 'all' (for all users in the organization), 'other' (for all other users who are not granted to the
-        entitlement(s) defined by this provisioning policy via other policies), or 'roles' (to specify specific roles
-        using the membership_roles argument).
-    :param membership_role_dns: A list of DNs of the roles to use to determine membership. This argument will be
-        ignored if membership_type is not set to 'roles'. This list cannot be empty if membership_type is set to
-        'roles'.
-    :param entitlements: A list of dicts representing entitlements for the policy. This list must contain at least
-        one entry. Each entry is expected to contain the following keys:
-            {
-                automatic: bool # Set to True for automatic provisioning, or False for manual provisioning.
-                ownership_type: str # Valid values are 'all', 'device', 'individual', 'system', or 'vendor'.
-                target_type: str # Determines how services will be targeted. Valid values are 'all' (for all services),
-                    'type' (for a service type), 'policy' (for a service selection policy), or 'specific' (for a
-                    specific service).
-                service_type: str # This attribute is only required if the target_type is set to 'type' or 'policy'.
-                    Provide the exact name of the service profile to target. Note that it is case-sensitive.
-                service_dn: str # This attribute is only required if the target_type is set to 'specific'. Provide the
-                    DN of the service to target.
-                workflow_dn: str # Set to the DN of a workflow to use, or None to not use a workflow.
-            }
-        Note: This API does not currently support adding service tags to entitlements.
+    :param memberships: A list of tuples containing the name and type of each membership, as returned by
+        _normalize_memberships.
+    :param entitlements: A list of the normalized entitlements for the policy, as returned by _normalize_entitlement.
     :return:
     """
 
@@ -747,95 +1039,22 @@ def _setup_policy_object(policy_type,
     if caption is not None:
         policy_object['caption'] = caption
 
-    entitlement_list = []
-
-    # Iterate through the entitlements argument and add each one to the request
-    for entitlement in entitlements:
-        entitlement_object = policy_entitlement_type()
-        service_target_object = service_target_type()
-
-        # Set type 0 for a service type (specify the name of the service profile in the name. MAKE SURE IT IS EXACT-
-        # IT IS CASE_SENSITIVE).
-        # Set type 1 for a specific service (specify it's DN in the name).
-        # Set type 2 for all services (specify * as the name).
-        # Set type 3 for a service selection policy (specify the name of the service profile in the name. MAKE SURE IT
-        # IS EXACT- IT IS CASE_SENSITIVE). The service selection policy will be automatically selected based on the
-        # service profile selected.
-
-        if entitlement['target_type'] is not None:
-            if entitlement['target_type'] == 'all':
-                service_target_object['name'] = '*'
-                service_target_object['type'] = '2'
-            elif entitlement['target_type'] == 'type':
-                service_target_object['name'] = entitlement['service_type']
-                service_target_object['type'] = '0'
-            elif entitlement['target_type'] == 'policy':
-                service_target_object['name'] = entitlement['service_type']
-                service_target_object['type'] = '3'
-            elif entitlement['target_type'] == 'specific':
-                service_target_object['name'] = entitlement['service_dn']
-                service_target_object['type'] = '1'
-            else:
-                raise ValueError("Invalid target_type value in entitlement. Valid values are 'all', 'type', 'policy', "
-                                 "or 'specific'.")
-
-        entitlement_object['serviceTarget'] = service_target_object
-
-        if entitlement['automatic'] is not None:
-            # The type value should be set to 0 for manual provisioning, or 1 for automatic provisioning
-            if entitlement['automatic']:
-                entitlement_object['type'] = 1
-            else:
-                entitlement_object['type'] = 0
-
-        if entitlement['workflow_dn'] is not None:
-            entitlement_object['processDN'] = str(entitlement['workflow_dn'])
-
-        if entitlement['ownership_type'] is not None:
-            if entitlement['ownership_type'].lower() == 'all':
-                entitlement_object['ownershipType'] = '*'
-            elif entitlement['ownership_type'].lower() == 'device':
-                entitlement_object['ownershipType'] = 'Device'
-            elif entitlement['ownership_type'].lower() == 'individual':
-                entitlement_object['ownershipType'] = 'Individual'
-            elif entitlement['ownership_type'].lower() == 'system':
-                entitlement_object['ownershipType'] = 'System'
-            elif entitlement['ownership_type'].lower() == 'vendor':
-                entitlement_object['ownershipType'] = 'Vendor'
-            else:
-                raise ValueError("Invalid value for entitlement ownership_type. Valid values are 'all', 'device', "
-                                 "'individual', 'system', or 'vendor'.")
-
-        entitlement_list.append(entitlement_object)
-
-    policy_object['entitlements'] = {'item': entitlement_list}
+    # The entitlements and memberships have already been normalized, so each SOAP object is created with all of it's
+    # values at once
+    policy_object['entitlements'] = {'item': [
+        policy_entitlement_type(
+            serviceTarget=service_target_type(name=entitlement.service_target_name,
+                                              type=entitlement.service_target_type),
+            type=entitlement.type,
+            processDN=entitlement.process_dn,
+            ownershipType=entitlement.ownership_type
+        )
+        for entitlement in entitlements
+    ]}
 
     # Add membership information to the request
-    membership_list = []
-    membership_object = policy_membership_type()
-
-    if membership_type is not None:
-        # Set type 2 for all users in the organization. Specify '*' as the name.
-        # Set type 3 to specify a specific role. Specify the role DN as the name. Create more membership objects for
-        # more roles.
-        # Set type 4 for all other users who are not granted to the entitlement(s) defined by this provisioning policy
-        # via other policies. Specify '*' as the name.
-        if membership_type == 'all':
-            membership_object['name'] = '*'
-            membership_object['type'] = '2'
-            membership_list.append(membership_object)
-        elif membership_type == 'other':
-            membership_object['name'] = '*'
-            membership_object['type'] = '4'
-            membership_list.append(membership_object)
-        elif membership_type == 'roles':
-            for role in membership_role_dns:
-                membership_object = policy_membership_type()
-                membership_object['name'] = str(role)
-                membership_object['type'] = '3'
-                membership_list.append(membership_object)
-        else:
-            raise ValueError("Invalid value for membership_type. Valid values are 'all', 'other', or 'roles'.")
+    membership_list = [policy_membership_type(name=membership_name, type=membership_type)
+                       for membership_name, membership_type in memberships]
 
     policy_object['membership'] = {'item': membership_list}
 
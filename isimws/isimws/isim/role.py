@@ -4,7 +4,7 @@ import logging
 from isimws.application.isimapplication import ISIMApplication, IBMResponse, create_return_object
 from isimws.utilities.tools import build_attribute, get_soap_attribute
 from isimws.utilities.dnencoder import DNEncoder
-import isimws
+from isimws.isim import container
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +18,7 @@ requires_version = None
 def search(isim_application: ISIMApplication,
            container_dn: Optional[str],
            ldap_filter: str = "(errolename=*)",
+           skip_container_lookup=False,
            check_mode=False,
            force=False) -> IBMResponse:
     """
@@ -25,6 +26,8 @@ def search(isim_application: ISIMApplication,
     :param isim_application: The ISIMApplication instance to connect to.
     :param container_dn: The optional DN of a container to search in. Set to None to search everywhere.
     :param ldap_filter: An LDAP filter string to search for.
+    :param skip_container_lookup: Set to True to identify the container by it's DN alone, rather than retrieving it
+        from the server first. The container isn't checked for existence.
     :param check_mode: Set to True to enable check mode.
     :param force: Set to True to force execution regardless of current state.
     :return: An IBMResponse object. If the call was successful, the data field will contain a list of the Python dict
@@ -44,7 +47,10 @@ def search(isim_application: ISIMApplication,
                                                        requires_version=requires_version)
     else:
         # Retrieve the container object (the business unit)
-        container_response = isimws.isim.container.get(isim_application=isim_application, container_dn=container_dn)
+        if skip_container_lookup:
+            container_response = container.get_reference(isim_application=isim_application, container_dn=container_dn)
+        else:
+            container_response = container.get(isim_application=isim_application, container_dn=container_dn)
 
         # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
         if container_response['rc'] != 0:
@@ -466,7 +472,7 @@ def _create(isim_application: ISIMApplication,
     attr_type = attribute_type_response['data']
 
     # Retrieve the container object (the business unit)
-    container_response = isimws.isim.container.get(isim_application=isim_application, container_dn=container_dn)
+    container_response = container.get(isim_application=isim_application, container_dn=container_dn)
 
     # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
     if container_response['rc'] != 0:
@@ -4,7 +4,7 @@ from collections import Counter
 from isimws.application.isimapplication import ISIMApplication, IBMResponse, create_return_object
 from isimws.utilities.tools import build_attribute, get_soap_attribute, list_soap_attribute_keys
 from isimws.utilities.dnencoder import DNEncoder
-import isimws
+from isimws.isim import container
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +33,7 @@ def search(isim_application: ISIMApplication,
     # The session object is handled by the ISIMApplication instance
     data = []
     # Retrieve the container object (the business unit)
-    container_response = isimws.isim.container.get(isim_application=isim_application, container_dn=container_dn)
+    container_response = container.get(isim_application=isim_application, container_dn=container_dn)
 
     # If an error was encountered and ignored, return the IBMResponse object so that Ansible can process it
     if container_response['rc'] != 0:
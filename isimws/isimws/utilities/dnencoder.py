@@ -1,22 +1,47 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+import weakref
 from isimws.application.isimapplication import ISIMApplication, IBMResponse, IBMError, IBMFatal
 import isimws.isim
 from isimws.utilities.tools import get_soap_attribute
 
 
+# Container paths that have already been resolved, keyed by the ISIMApplication instance and then by path. A new
+# DNEncoder is created for each apply call, so the resolved paths are shared by every DNEncoder using the same
+# ISIMApplication.
+_container_path_cache = weakref.WeakKeyDictionary()
+
+# The object types that encode_batch_to_isim_dns() can resolve several of with a single search, mapped to the LDAP
+# attribute holding the name of each object
+_batch_name_attributes = {
+    'person': 'uid',
+    'role': 'errolename',
+    'service': 'erservicename'
+}
+
+
 class DNEncoder:
     isim_application: ISIMApplication
     organization_map: Dict  # maps organization names to DNs
+    container_map: Dict  # maps container DNs to container objects that have already been retrieved
+    _path_cache: Dict[str, str]  # maps container paths to DNs that have already been resolved
+    _dn_cache: Dict[Tuple[str, str, str], Optional[str]]  # maps objects that have already been resolved to their DNs
 
     def __init__(self, isim_application: ISIMApplication):
         self.isim_application = isim_application
+        self.container_map = {}
+        self._path_cache = _container_path_cache.setdefault(isim_application, {})
+        # Objects can be created or deleted between apply calls, so resolved objects are only cached for the lifetime
+        # of this DNEncoder
+        self._dn_cache = {}
 
         # Retrieve organization DN mappings from the ISIMApplication
         self.organization_map = {}
+        # Only the name and DN of each organization are read, so the response doesn't need to be serialized
         response = isim_application.invoke_soap_request("Retrieving organizations list",
                                                         "WSOrganizationalContainerService",
                                                         "getOrganizationTree",
-                                                        [])
+                                                        [],
+                                                        raw=True)
 
         if response['rc'] != 0:
             raise ValueError('Cannot retrieve organization information from the application server.')
@@ -149,7 +174,22 @@ class DNEncoder:
                 name is None or \
                 object_type is None:
             raise ValueError("You must supply values for container_path, name, and object_type.")
-        
+
+        # The same workflows, services and roles are often referenced several times in one apply call
+        cache_key = (container_path, name, object_type)
+        if cache_key not in self._dn_cache:
+            self._dn_cache[cache_key] = self._lookup_isim_dn(container_path=container_path, name=name,
+                                                             object_type=object_type)
+        return self._dn_cache[cache_key]
+
+    def _lookup_isim_dn(self, container_path: str, name: str, object_type: str) -> Optional[str]:
+        """
+        Retrieve the ISIM DN of an object from the server. Used by encode_to_isim_dn().
+        :param: container_path: The container path of the parent container.
+        :param: name: The name of the object.
+        :param: object_type: The type of the object.
+        :return: The ISIM DN referring to the object.
+        """
         # Retrieving workflow objects is not supported by the get_unique_object() function, so the logic to resolve
         # a workflow to a DN is implemented here instead.
         if object_type == "workflow":
@@ -197,6 +237,85 @@ class DNEncoder:
                                                 "'person', 'service', 'provisioningpolicy', 'container', and "
                                                 "'workflow'.")
 
+    def encode_batch_to_isim_dns(self, entries: List[Tuple[str, str, str]]) -> List[Optional[str]]:
+        """
+        Takes a list of container paths, names and types referring to ISIM objects and retrieves their ISIM DNs. This
+            produces the same results as calling encode_to_isim_dn() for each entry, but people are resolved with a
+            single search, and roles and services are resolved with a single search per parent container, rather than
+            one search per object. Returns None in place of any object that doesn't exist, and raises a ValueError if
+            multiple objects exist that meet the criteria for an entry.
+        :param: entries: A list of tuples containing the container path, name and object type of each object. See
+            encode_to_isim_dn() for the expected format of each value.
+        :return: A list of the ISIM DNs referring to each object, in the same order as the entries.
+        """
+        # Group the entries that haven't been resolved yet by the search that can find them. People are searched for
+        # from the root, while roles and services are searched for in their parent container.
+        groups = {}
+        for entry in entries:
+            container_path, name, object_type = entry
+            if object_type in _batch_name_attributes and entry not in self._dn_cache:
+                if container_path is None or name is None:
+                    raise ValueError("You must supply values for container_path, name, and object_type.")
+                search_path = None if object_type == 'person' else container_path
+                groups.setdefault((object_type, search_path), {})[entry] = None
+
+        # A single object doesn't benefit from a combined search, so it is left to encode_to_isim_dn()
+        for (object_type, search_path), group_entries in groups.items():
+            if len(group_entries) > 1:
+                self._search_batch(object_type, search_path, list(group_entries))
+
+        return [self.encode_to_isim_dn(container_path=container_path, name=name, object_type=object_type)
+                for container_path, name, object_type in entries]
+
+    def _search_batch(self, object_type: str, search_path: Optional[str], entries: List[Tuple[str, str, str]]):
+        """
+        Resolve several objects of the same type with a single search, and add their DNs to the cache used by
+            encode_to_isim_dn(). Used by encode_batch_to_isim_dns().
+        :param object_type: The type of the objects. Must be one of the keys of _batch_name_attributes.
+        :param search_path: The container path to search in, or None to search from the root.
+        :param entries: A list of tuples containing the container path, name and object type of each object.
+        """
+        # Each name only needs to appear in the filter once. The order of the entries is preserved.
+        names = list(dict.fromkeys(name for container_path, name, entry_type in entries))
+        name_attribute = _batch_name_attributes[object_type]
+        ldap_filter = "(|" + "".join("(" + name_attribute + "=" + name + ")" for name in names) + ")"
+
+        if object_type == 'person':
+            search_response = isimws.isim.person.search(isim_application=self.isim_application,
+                                                        ldap_filter=ldap_filter)
+        elif object_type == 'role':
+            search_response = isimws.isim.role.search(isim_application=self.isim_application,
+                                                      container_dn=self.container_path_to_dn(search_path),
+                                                      ldap_filter=ldap_filter)
+        else:
+            search_response = isimws.isim.service.search(isim_application=self.isim_application,
+                                                         container_dn=self.container_path_to_dn(search_path),
+                                                         ldap_filter=ldap_filter)
+
+        if search_response['rc'] != 0:
+            raise ValueError("An error was encountered while searching for " + object_type + "s with the names " +
+                             ", ".join(names) + ".")
+
+        # Index the results by name and parent container DN so that each entry can be matched exactly, in the same way
+        # as get_unique_object()
+        matches = {}
+        for result in search_response['data']:
+            if object_type == 'person':
+                result_name = get_soap_attribute(result, "uid")[0]
+            else:
+                result_name = result['name']
+            key = (result_name, get_soap_attribute(result, "erparent")[0])
+            matches.setdefault(key, []).append(result['itimDN'])
+
+        for entry in entries:
+            container_path, name, entry_type = entry
+            object_dns = matches.get((name, self.container_path_to_dn(container_path)), [])
+
+            if len(object_dns) > 1:
+                raise ValueError("Unable to uniquely identify object. More than one " + object_type + " was found "
+                                 "with the name " + name + " in " + container_path + ".")
+            self._dn_cache[entry] = object_dns[0] if object_dns else None
+
     def get_unique_object(self, container_path: str, name: str, object_type: str) -> Optional[Dict]:
         """
         Takes a container path, a name and a type referring to an ISIM object and retrieves it. Returns None
@@ -243,7 +362,8 @@ class DNEncoder:
             search_response = isimws.isim.provisioningpolicy.search(
                 isim_application=self.isim_application,
                 container_dn=container_dn,
-                policy_name=name
+                policy_name=name,
+                exact_match=True
             )
         elif object_type == "container":
             name_components = name.split("::")
@@ -268,7 +388,8 @@ class DNEncoder:
                     isim_application=self.isim_application,
                     parent_dn=container_dn,
                     container_name=name,
-                    profile=profile
+                    profile=profile,
+                    parent_container_object=self.get_container(container_dn)
                 )
         else:
             raise ValueError(str(object_type) + " is not a valid value for object_type. Valid values are 'role', "
@@ -318,6 +439,9 @@ class DNEncoder:
             the root container (i.e. the parent of all organizations), use "//".
         :return: An ISIM DN referring to the specified container.
         """
+        if path in self._path_cache:
+            return self._path_cache[path]
+
         # Validate the path format and determine whether it refers to the root container
         components = path.split('//')
         if len(components) < 2:
@@ -363,8 +487,20 @@ class DNEncoder:
             parent_dn = next_container['itimDN']
             next_component_index += 1
 
+        self._path_cache[path] = parent_dn
         return parent_dn
 
+    def clear_cache(self):
+        """
+        Discard all of the container paths, container objects and object DNs that have already been resolved, so that
+            they will be retrieved from the application server the next time they are needed. The resolved container
+            paths are shared with every DNEncoder using the same ISIMApplication, so they will be discarded for those as
+            well.
+        """
+        self._path_cache.clear()
+        self.container_map.clear()
+        self._dn_cache.clear()
+
     def dn_to_container_path(self, dn: str) -> str:
         """
         Takes an ISIM DN referring to an ISIM organizational container and converts it to a container path in the format
@@ -388,15 +524,7 @@ class DNEncoder:
 
         while True:
             # Look up the DN, add it to the container path, and retrieve it's parent's DN.
-            get_response = isimws.isim.container.get(self.isim_application,
-                                                     container_dn=current_dn
-                                                     )
-
-            # If an error was encountered and ignored, raise an exception
-            if get_response['rc'] != 0:
-                raise ValueError(
-                    "There was an error while retrieving a container. Return code: " + get_response['rc'])
-            result = get_response['data']
+            result = self.get_container(current_dn)
 
             # If the object is not a container, it will be missing expected fields.
             if 'name' not in result or \
@@ -427,3 +555,25 @@ class DNEncoder:
 
             container_path = "//" + profile + "::" + result['name'] + container_path
             current_dn = get_soap_attribute(result, "erparent")[0]
+
+    def get_container(self, dn: str) -> Dict:
+        """
+        Retrieve an organizational container object by it's DN. Containers are looked up repeatedly while resolving
+            paths and creating objects, so each container object is only retrieved from the application server once
+            for the lifetime of the DNEncoder.
+        :param: dn: The ISIM DN of the container.
+        :return: The container object as returned by the SOAP API.
+        """
+        if dn in self.container_map:
+            return self.container_map[dn]
+
+        get_response = isimws.isim.container.get(self.isim_application, container_dn=dn)
+
+        # If an error was encountered and ignored, raise an exception
+        if get_response['rc'] != 0:
+            raise ValueError("There was an error while retrieving a container. Return code: " +
+                             str(get_response['rc']))
+
+        container_object = get_response['data']
+        self.container_map[dn] = container_object
+        return container_object
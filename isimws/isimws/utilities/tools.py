@@ -1,7 +1,7 @@
-from typing import List, Dict, Optional
-from collections import OrderedDict
+from typing import List, Dict, Optional, Callable, Tuple
+from concurrent.futures import ThreadPoolExecutor
 
-from isimws.application.isimapplication import IBMResponse
+from isimws.application.isimapplication import IBMResponse, create_return_object
 
 
 def build_attribute(attribute_type, key: str, value_list: List):
@@ -20,6 +20,25 @@ def build_attribute(attribute_type, key: str, value_list: List):
     return attr
 
 
+def build_attributes(attribute_type, items: List[Tuple[str, List]]) -> List:
+    """
+    Build a list of SOAP ns1:WSAttribute objects in one pass.
+    :param attribute_type: The SOAP type that can be used to instantiate the objects.
+    :param items: A list of tuples containing the key and the list of values for each attribute. Provide an empty list
+        of values to set an attribute to an empty value.
+    :return: A list of the Python representations of the SOAP objects, in the same order as items.
+    """
+    attributes = []
+    for key, value_list in items:
+        attr = attribute_type()
+        attr['name'] = key
+        attr['operation'] = 0
+        attr['isEncoded'] = False
+        attr['values'] = {'item': value_list}
+        attributes.append(attr)
+    return attributes
+
+
 def get_soap_attribute(returned_object: Dict, key: str) -> Optional[List]:
     """
     A method to simplify parsing of objects (such as services or roles) returned by the SOAP API when using a search or
@@ -51,10 +70,7 @@ def list_soap_attribute_keys(returned_object: Dict) -> Optional[List]:
     :return: A list of keys in the object's attributes list.
     """
     attributes = returned_object['attributes']['item']
-    keys = []
-    for attribute in attributes:
-        keys.append(attribute['name'].lower())
-    return keys
+    return [attribute['name'].lower() for attribute in attributes]
 
 
 def strip_zeep_element_data(response: IBMResponse) -> IBMResponse:
@@ -68,12 +84,66 @@ def strip_zeep_element_data(response: IBMResponse) -> IBMResponse:
     :param response: An IBMResponse object returned by a call to ISIMApplication.invoke_soap_request().
     :return: The IBMResponse object with the Zeep Element data removed from it's data attribute.
     """
-    if isinstance(response['data'], list):
-        for result in response['data']:
-            for element in result['children']['item']:
-                del element['_raw_elements']
-    elif isinstance(response['data'], OrderedDict):
-        for element in response['data']['children']['item']:
-            del element['_raw_elements']
+    data = response['data']
+    if isinstance(data, list):
+        results = data
+    elif isinstance(data, dict):
+        results = [data]
+    else:
+        return response
+
+    # The data is walked in place, so no copy of the response is made
+    for result in results:
+        children = result.get('children')
+        if children is None or children['item'] is None:
+            continue
+        for element in children['item']:
+            element.pop('_raw_elements', None)
 
     return response
+
+
+def gather_responses(calls: List[Callable[[], IBMResponse]], max_workers: int = 8) -> IBMResponse:
+    """
+    Run several independent calls to the SOAP API concurrently and combine their responses. Each call is made through
+    the same ISIMApplication, whose session is safe to share between threads.
+    :param calls: A list of functions that each take no arguments and return an IBMResponse object, such as
+        functools.partial objects wrapping the get or search function of a module.
+    :param max_workers: The maximum number of calls to send to the server at the same time.
+    :return: An IBMResponse object. If all of the calls were successful, the data field will contain a list of the
+        data returned by each call, in the same order as the calls argument. Otherwise, the response of the first call
+        that failed will be returned.
+    """
+    if len(calls) < 1:
+        return create_return_object(data=[])
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(calls))) as executor:
+        responses = list(executor.map(lambda call: call(), calls))
+
+    for response in responses:
+        if response['rc'] != 0:
+            return response
+
+    return create_return_object(data=[response['data'] for response in responses],
+                                changed=any(response['changed'] for response in responses))
+
+
+def combine_write_responses(responses: List[IBMResponse]) -> IBMResponse:
+    """
+    Combine the responses of several independent calls that modify the server, such as the concurrent create or
+    modify requests sent by a *_many function. A failed call doesn't undo the calls that succeeded, so their results
+    are kept even when an error is returned.
+    :param responses: A list of IBMResponse objects, one for each call.
+    :return: An IBMResponse object. The data field will contain a list of the data returned by each call, in the same
+        order as the responses argument, with None in place of any call that failed. If any of the calls failed, the rc
+        and warnings fields will be those of the first call that failed, and the changed field will be True if any of
+        the other calls succeeded.
+    """
+    changed = any(response['changed'] for response in responses if response['rc'] == 0)
+    data = [response['data'] if response['rc'] == 0 else None for response in responses]
+
+    for response in responses:
+        if response['rc'] != 0:
+            return create_return_object(rc=response['rc'], data=data, warnings=response['warnings'], changed=changed)
+
+    return create_return_object(data=data, changed=changed)